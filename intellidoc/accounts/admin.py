@@ -15,3 +15,6 @@ class UserAdmin(DjangoUserAdmin):
     list_display = ("email", "first_name", "last_name", "is_staff", "plan")
     search_fields = ("email", "first_name", "last_name")
     ordering = ("email",)
+    list_select_related = True
+    list_per_page = 50
+    show_full_result_count = False
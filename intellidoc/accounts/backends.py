@@ -0,0 +1,26 @@
+# accounts/backends.py
+from django.contrib.auth.backends import ModelBackend
+
+from .models import User
+
+# Columns needed on every authenticated request; only the profile-page fields
+# (avatar, bio, phone) are deferred and loaded lazily where they are rendered.
+# Timestamps stay loaded so a plain request.user.save() writes no stale values.
+SESSION_USER_FIELDS = (
+    "id", "password", "last_login", "is_active", "is_staff", "is_superuser",
+    "email", "username", "first_name", "last_name", "date_joined",
+    "plan", "documents_uploaded", "storage_used", "queries_made",
+    "last_active", "created_at", "updated_at",
+    "email_notifications", "dark_mode",
+)
+
+
+class SessionUserBackend(ModelBackend):
+    """Model backend that loads the session user with a narrow column set"""
+
+    def get_user(self, user_id):
+        try:
+            user = User._default_manager.only(*SESSION_USER_FIELDS).get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -25,7 +25,7 @@ class CustomUserCreationForm(UserCreationForm):
 
     def save(self, commit=True):
         user = super().save(commit=False)
-        user.username = self.cleaned_data["email"].split("@")[0]  # auto username
+        user.username = User.objects.unique_username(self.cleaned_data["email"].split("@")[0])  # auto username
         if commit:
             user.save()
         return user
@@ -1,8 +1,20 @@
 # accounts/models.py
+from types import MappingProxyType
+
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.core.cache import cache
 from django.db import models
+from django.db.models import F
 from django.utils import timezone
 
+PLAN_LIMITS = MappingProxyType({
+    "free": MappingProxyType({"documents": 10, "storage": 100 * 1024 * 1024, "queries": 100}),
+    "pro": MappingProxyType({"documents": 100, "storage": 1024 * 1024 * 1024, "queries": 1000}),
+    "enterprise": MappingProxyType({"documents": -1, "storage": -1, "queries": -1}),
+})
+
+LAST_ACTIVE_DEBOUNCE = 300  # seconds
+
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
@@ -12,12 +24,22 @@ class UserManager(BaseUserManager):
             raise ValueError("The email must be set")
         email = self.normalize_email(email)
         if username is None:
-            username = email.split("@")[0]
+            username = self.unique_username(email.split("@")[0])
         user = self.model(email=email, username=username, **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
         return user
 
+    def unique_username(self, base):
+        """Return base, or base with the smallest numeric suffix not yet taken"""
+        existing = set(self.filter(username__startswith=base).values_list("username", flat=True))
+        if base not in existing:
+            return base
+        i = 1
+        while f"{base}{i}" in existing:
+            i += 1
+        return f"{base}{i}"
+
     def create_user(self, email, username=None, password=None, **extra_fields):
         extra_fields.setdefault("is_staff", False)
         extra_fields.setdefault("is_superuser", False)
@@ -79,16 +101,14 @@ class User(AbstractUser):
 
     def get_plan_limits(self):
         """Get plan-specific limits"""
-        limits = {
-            "free": {"documents": 10, "storage": 100 * 1024 * 1024, "queries": 100},
-            "pro": {"documents": 100, "storage": 1024 * 1024 * 1024, "queries": 1000},
-            "enterprise": {"documents": -1, "storage": -1, "queries": -1},
-        }
-        return limits.get(self.plan, limits["free"])
+        return PLAN_LIMITS.get(self.plan, PLAN_LIMITS["free"])
 
     def can_upload_document(self, file_size):
         """Check if user can upload document"""
-        limits = self.get_plan_limits()
+        if self.plan == "enterprise":
+            return True, "OK"
+
+        limits = PLAN_LIMITS.get(self.plan, PLAN_LIMITS["free"])
 
         if limits["documents"] != -1 and self.documents_uploaded >= limits["documents"]:
             return False, "Document limit reached for your plan"
@@ -99,9 +119,17 @@ class User(AbstractUser):
         return True, "OK"
 
     def update_usage(self, documents_delta=0, storage_delta=0, queries_delta=0):
-        """Update user usage stats"""
-        self.documents_uploaded += documents_delta
-        self.storage_used += storage_delta
-        self.queries_made += queries_delta
-        self.last_active = timezone.now()
-        self.save(update_fields=["documents_uploaded", "storage_used", "queries_made", "last_active"])
+        """Update user usage stats atomically in the database.
+
+        The counters are incremented server-side, so the in-memory values on
+        this instance are not refreshed; call refresh_from_db() if needed.
+        last_active is written at most once per LAST_ACTIVE_DEBOUNCE seconds.
+        """
+        values = {
+            "documents_uploaded": F("documents_uploaded") + documents_delta,
+            "storage_used": F("storage_used") + storage_delta,
+            "queries_made": F("queries_made") + queries_delta,
+        }
+        if cache.add(f"user:last_active:{self.pk}", 1, timeout=LAST_ACTIVE_DEBOUNCE):
+            self.last_active = values["last_active"] = timezone.now()
+        User.objects.filter(pk=self.pk).update(**values)
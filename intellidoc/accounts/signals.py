@@ -0,0 +1,33 @@
+# accounts/signals.py
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from chat.models import Conversation
+from core.cache import bump_search_version, bump_stats_version
+from documents.models import Document, DocumentCollection
+
+
+@receiver([post_save, post_delete], sender=Document)
+def invalidate_user_search(sender, instance, update_fields=None, **kwargs):
+    # Chunks are written before the status save that makes a document ready;
+    # counter-only saves such as increment_view_count don't change results
+    if update_fields is None or 'status' in update_fields:
+        bump_search_version(instance.owner_id)
+
+
+@receiver([post_save, post_delete], sender=Document)
+@receiver([post_save, post_delete], sender=DocumentCollection)
+def invalidate_user_stats(sender, instance, **kwargs):
+    bump_stats_version(instance.owner_id)
+
+
+@receiver(m2m_changed, sender=DocumentCollection.documents.through)
+def invalidate_user_collection_counts(sender, instance, action, **kwargs):
+    # instance is the collection or the document, depending on the side used
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_stats_version(instance.owner_id)
+
+
+@receiver([post_save, post_delete], sender=Conversation)
+def invalidate_user_chat_stats(sender, instance, **kwargs):
+    bump_stats_version(instance.user_id)
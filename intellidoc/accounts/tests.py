@@ -1,3 +1,139 @@
+import json
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import User
+
+
+class SessionUserTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="session@example.com", password="pw")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_request_user_defers_profile_fields_only(self):
+        response = self.client.get(reverse('documents:list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.wsgi_request.user.get_deferred_fields(), {"avatar", "bio", "phone"}
+        )
+
+    def test_normal_request_does_not_load_deferred_fields(self):
+        for url in (reverse('documents:list'), reverse('chat:list')):
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            user_queries = [q["sql"] for q in queries if '"accounts_user"' in q["sql"]]
+            self.assertEqual(len(user_queries), 1)
+            self.assertNotIn('"bio"', user_queries[0])
+
+
+class UserManagerTests(TestCase):
+
+    def test_username_from_email(self):
+        user = User.objects.create_user(email="alice@example.com", password="pw")
+        self.assertEqual(user.username, "alice")
+
+    def test_username_takes_smallest_free_suffix(self):
+        User.objects.create_user(email="alice@example.com", password="pw")
+        User.objects.create_user(email="alice2@example.org", username="alice2", password="pw")
+        second = User.objects.create_user(email="alice@example.org", password="pw")
+        third = User.objects.create_user(email="alice@example.net", password="pw")
+        self.assertEqual(second.username, "alice1")
+        self.assertEqual(third.username, "alice3")
+
+    def test_explicit_duplicate_username_rejected(self):
+        User.objects.create_user(email="bob@example.com", password="pw")
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user(email="robert@example.com", username="bob", password="pw")
+
+    def test_email_required(self):
+        with self.assertRaises(ValueError):
+            User.objects.create_user(email="", password="pw")
+
+
+class UpdateUsageTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="usage@example.com", password="pw")
+
+    def test_increments_in_database(self):
+        stale = User.objects.get(pk=self.user.pk)
+        self.user.update_usage(documents_delta=1, storage_delta=100)
+        # A second, stale instance must not overwrite the first increment
+        stale.update_usage(documents_delta=1, storage_delta=50, queries_delta=2)
+        self.user.refresh_from_db()
+        self.assertEqual(
+            (self.user.documents_uploaded, self.user.storage_used, self.user.queries_made),
+            (2, 150, 2),
+        )
+
+    def test_negative_delta(self):
+        User.objects.filter(pk=self.user.pk).update(storage_used=100)
+        self.user.update_usage(storage_delta=-40)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.storage_used, 60)
+
+    def test_last_active_debounced(self):
+        with self.assertNumQueries(1):
+            self.user.update_usage(queries_delta=1)
+        first = User.objects.values_list("last_active", flat=True).get(pk=self.user.pk)
+        self.user.update_usage(queries_delta=1)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_active, first)
+        self.assertEqual(self.user.queries_made, 2)
+
+
+class UserSettingsViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="settings@example.com", password="pw")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('accounts:settings')
+
+    def test_htmx_single_setting(self):
+        response = self.client.post(self.url, {'setting': 'dark_mode', 'value': 'true'})
+        self.assertEqual(response.json(), {'success': True, 'updated': ['dark_mode']})
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.dark_mode)
+
+    def test_json_several_settings(self):
+        response = self.client.post(
+            self.url,
+            json.dumps({'dark_mode': True, 'email_notifications': False}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.dark_mode)
+        self.assertFalse(self.user.email_notifications)
+
+    def test_unknown_setting_rejected(self):
+        for data, content_type in (
+            ({'setting': 'is_staff', 'value': 'true'}, None),
+            (json.dumps({'dark_mode': True, 'plan': 'enterprise'}), 'application/json'),
+        ):
+            with self.subTest(data=data):
+                kwargs = {'content_type': content_type} if content_type else {}
+                response = self.client.post(self.url, data, **kwargs)
+                self.assertEqual(response.status_code, 400)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_staff)
+        self.assertFalse(self.user.dark_mode)
+        self.assertEqual(self.user.plan, 'free')
 
-# Create your tests here.
+    def test_invalid_json_rejected(self):
+        for body in ('{not json', '[1, 2]'):
+            with self.subTest(body=body):
+                response = self.client.post(self.url, body, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
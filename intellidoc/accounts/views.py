@@ -1,7 +1,10 @@
 # accounts/views.py - COMPLETE AUTHENTICATION VIEWS
 
+import json
+from types import MappingProxyType
+
 from django.shortcuts import render, redirect
-from django.contrib.auth import login, authenticate
+from django.contrib.auth import login
 from django.contrib.auth.views import LoginView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
@@ -9,15 +12,58 @@ from django.contrib import messages
 from django.views.generic import CreateView, UpdateView, TemplateView
 from django.urls import reverse_lazy
 from django.http import JsonResponse
-from django.db.models import Count, Sum
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 from .models import User
+from core.cache import DASHBOARD_STATS_KEY, PROFILE_STATS_KEY, STATS_CACHE_TIMEOUT, stats_version
 from .forms import CustomUserCreationForm, CustomAuthenticationForm
 from documents.models import Document, DocumentCollection
 from django.conf import settings
 from django.shortcuts import resolve_url
 
+# Plan comparison shown on the upgrade page (read-only, shared across requests)
+PLANS = MappingProxyType({
+    'free': MappingProxyType({
+        'name': 'Free',
+        'price': '$0',
+        'features': (
+            '10 documents',
+            '100MB storage',
+            '100 AI queries/month',
+            'Basic support'
+        )
+    }),
+    'pro': MappingProxyType({
+        'name': 'Pro',
+        'price': '$19',
+        'features': (
+            '100 documents',
+            '1GB storage',
+            '1000 AI queries/month',
+            'Priority support',
+            'API access',
+            'Advanced analytics'
+        )
+    }),
+    'enterprise': MappingProxyType({
+        'name': 'Enterprise',
+        'price': '$99',
+        'features': (
+            'Unlimited documents',
+            'Unlimited storage',
+            'Unlimited AI queries',
+            '24/7 dedicated support',
+            'Custom integrations',
+            'White-label option',
+            'On-premise deployment'
+        )
+    }),
+})
+
+
 class RegisterView(CreateView):
     model = User
     form_class = CustomUserCreationForm
@@ -25,16 +71,12 @@ class RegisterView(CreateView):
 
     def form_valid(self, form):
         user = form.save()
-        raw_password = form.cleaned_data.get("password1")
-
-        # authenticate directly with email
-        user = authenticate(self.request, email=user.email, password=raw_password)
-        if user:
-            login(self.request, user)
-            messages.success(self.request, "Welcome to IntelliDoc AI 🎉")
-            return redirect("accounts:dashboard")
 
-        return super().form_valid(form)
+        # The user was just created with a known password, so log in directly
+        # instead of re-running the password hasher through authenticate()
+        login(self.request, user, backend="accounts.backends.SessionUserBackend")
+        messages.success(self.request, "Welcome to IntelliDoc AI 🎉")
+        return redirect("accounts:dashboard")
 
 
 class CustomLoginView(LoginView):
@@ -45,6 +87,68 @@ class CustomLoginView(LoginView):
         return self.get_redirect_url() or resolve_url(settings.LOGIN_REDIRECT_URL)
 
 
+def _compute_profile_context(user):
+    """Document stats and recent activity shown on the profile page"""
+    doc_stats = Document.objects.filter(owner=user).aggregate(
+        documents_count=Count('id', filter=~Q(status='deleted')),
+        ready_documents=Count('id', filter=Q(status='ready')),
+        total_storage=Coalesce(Sum('file_size', filter=~Q(status='deleted')), 0),
+    )
+    return {
+        'stats': {
+            **doc_stats,
+            'collections_count': DocumentCollection.objects.filter(owner=user).count(),
+        },
+        'recent_documents': list(
+            Document.objects.active().filter(owner=user).values(
+                'id', 'title', 'status', 'file_type', 'file_size', 'uploaded_at'
+            ).order_by('-uploaded_at')[:5]
+        ),
+    }
+
+
+def _compute_dashboard_context(user):
+    """Upload, status and storage analytics shown on the dashboard"""
+    now = timezone.now()
+    week_ago = now - timedelta(days=7)
+    month_ago = now - timedelta(days=30)
+    
+    # Upload and status stats in a single aggregate query
+    not_deleted = ~Q(status='deleted')
+    doc_stats = Document.objects.filter(owner=user).aggregate(
+        weekly=Count('id', filter=Q(uploaded_at__gte=week_ago) & not_deleted),
+        monthly=Count('id', filter=Q(uploaded_at__gte=month_ago) & not_deleted),
+        ready=Count('id', filter=Q(status='ready')),
+        processing=Count('id', filter=Q(status='processing')),
+        error=Count('id', filter=Q(status='error')),
+    )
+    
+    return {
+        'weekly_uploads': doc_stats['weekly'],
+        'monthly_uploads': doc_stats['monthly'],
+        # Processing status breakdown
+        'status_breakdown': {
+            'ready': doc_stats['ready'],
+            'processing': doc_stats['processing'],
+            'error': doc_stats['error'],
+        },
+        # Most accessed documents
+        'popular_documents': list(
+            Document.objects.filter(owner=user, status='ready').values(
+                'id', 'title', 'status', 'file_type', 'file_size', 'uploaded_at',
+                'query_count', 'view_count'
+            ).order_by('-query_count', '-view_count')[:5]
+        ),
+        # Storage usage by file type
+        'storage_by_type': list(
+            Document.objects.active().filter(owner=user).values('file_type').annotate(
+                total_size=Sum('file_size'),
+                count=Count('id')
+            ).order_by('-total_size')
+        ),
+    }
+
+
 class ProfileView(LoginRequiredMixin, TemplateView):
     """User profile view with stats"""
     
@@ -54,20 +158,13 @@ class ProfileView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         user = self.request.user
         
-        # User statistics
-        context['stats'] = {
-            'documents_count': Document.objects.filter(owner=user).exclude(status='deleted').count(),
-            'ready_documents': Document.objects.filter(owner=user, status='ready').count(),
-            'total_storage': Document.objects.filter(owner=user).exclude(status='deleted').aggregate(
-                total=Sum('file_size'))['total'] or 0,
-            'total_queries': user.queries_made,
-            'collections_count': DocumentCollection.objects.filter(owner=user).count(),
-        }
-        
-        # Recent activity
-        context['recent_documents'] = Document.objects.filter(
-            owner=user
-        ).exclude(status='deleted').order_by('-uploaded_at')[:5]
+        # Document stats and recent activity, cached until the user's documents change
+        context.update(cache.get_or_set(
+            PROFILE_STATS_KEY.format(user_id=user.id, version=stats_version(user.id)),
+            lambda: _compute_profile_context(user),
+            STATS_CACHE_TIMEOUT,
+        ))
+        context['stats'] = {**context['stats'], 'total_queries': user.queries_made}
         
         # Plan limits
         context['plan_limits'] = user.get_plan_limits()
@@ -83,65 +180,48 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         user = self.request.user
         
-        # Time-based stats
-        now = timezone.now()
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        
-        # Document stats over time
-        context['weekly_uploads'] = Document.objects.filter(
-            owner=user,
-            uploaded_at__gte=week_ago
-        ).exclude(status='deleted').count()
-        
-        context['monthly_uploads'] = Document.objects.filter(
-            owner=user,
-            uploaded_at__gte=month_ago
-        ).exclude(status='deleted').count()
-        
-        # Processing status breakdown
-        context['status_breakdown'] = {
-            'ready': Document.objects.filter(owner=user, status='ready').count(),
-            'processing': Document.objects.filter(owner=user, status='processing').count(),
-            'error': Document.objects.filter(owner=user, status='error').count(),
-        }
-        
-        # Most accessed documents
-        context['popular_documents'] = Document.objects.filter(
-            owner=user,
-            status='ready'
-        ).order_by('-query_count', '-view_count')[:5]
-        
-        # Storage usage by file type
-        from django.db.models import Sum, Case, When, CharField
-        context['storage_by_type'] = Document.objects.filter(
-            owner=user
-        ).exclude(status='deleted').values('file_type').annotate(
-            total_size=Sum('file_size'),
-            count=Count('id')
-        ).order_by('-total_size')
+        # Analytics, cached until the user's documents change
+        context.update(cache.get_or_set(
+            DASHBOARD_STATS_KEY.format(user_id=user.id, version=stats_version(user.id)),
+            lambda: _compute_dashboard_context(user),
+            STATS_CACHE_TIMEOUT,
+        ))
         
         return context
 
+# Boolean preferences that can be toggled from the settings page
+ALLOWED_SETTINGS = {'email_notifications', 'dark_mode'}
+
+
 class UserSettingsView(LoginRequiredMixin, TemplateView):
     """User settings and preferences"""
     
     template_name = 'accounts/settings.html'
     
     def post(self, request, *args, **kwargs):
-        # Handle settings updates via HTMX
-        setting = request.POST.get('setting')
-        value = request.POST.get('value')
-        
-        if setting == 'email_notifications':
-            request.user.email_notifications = value.lower() == 'true'
-            request.user.save(update_fields=['email_notifications'])
-            
-        elif setting == 'dark_mode':
-            request.user.dark_mode = value.lower() == 'true'
-            request.user.save(update_fields=['dark_mode'])
-        
-        return JsonResponse({'success': True})
+        # Handle settings updates via HTMX (single setting) or JSON (several at once)
+        if request.content_type == 'application/json':
+            try:
+                data = json.loads(request.body)
+            except json.JSONDecodeError:
+                data = None
+            if not isinstance(data, dict):
+                return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+        else:
+            data = {request.POST.get('setting'): request.POST.get('value')}
+        
+        unknown = set(data) - ALLOWED_SETTINGS
+        if unknown:
+            return JsonResponse(
+                {'success': False, 'error': f"Unknown setting: {', '.join(sorted(map(str, unknown)))}"},
+                status=400,
+            )
+        
+        payload = {setting: str(value).lower() == 'true' for setting, value in data.items()}
+        if payload:
+            User.objects.filter(pk=request.user.pk).update(**payload)
+        
+        return JsonResponse({'success': True, 'updated': list(payload)})
 
 class UpgradePlanView(LoginRequiredMixin, TemplateView):
     """Plan upgrade page"""
@@ -151,45 +231,7 @@ class UpgradePlanView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Plan comparison
-        context['plans'] = {
-            'free': {
-                'name': 'Free',
-                'price': '$0',
-                'features': [
-                    '10 documents',
-                    '100MB storage', 
-                    '100 AI queries/month',
-                    'Basic support'
-                ]
-            },
-            'pro': {
-                'name': 'Pro',
-                'price': '$19',
-                'features': [
-                    '100 documents',
-                    '1GB storage',
-                    '1000 AI queries/month',
-                    'Priority support',
-                    'API access',
-                    'Advanced analytics'
-                ]
-            },
-            'enterprise': {
-                'name': 'Enterprise',
-                'price': '$99',
-                'features': [
-                    'Unlimited documents',
-                    'Unlimited storage',
-                    'Unlimited AI queries',
-                    '24/7 dedicated support',
-                    'Custom integrations',
-                    'White-label option',
-                    'On-premise deployment'
-                ]
-            }
-        }
-        
+        context['plans'] = PLANS
         context['current_plan'] = self.request.user.plan
         
         return context
\ No newline at end of file
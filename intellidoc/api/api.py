@@ -1,8 +1,9 @@
 # api/api.py
 from ninja import NinjaAPI
+from .renderers import ORJSONRenderer
 from .routers import documents_router, chat_router, auth_router
 
-api = NinjaAPI(title="IntelliDoc API", version="1.0.0")
+api = NinjaAPI(title="IntelliDoc API", version="1.0.0", renderer=ORJSONRenderer())
 
 # Include routers
 api.add_router("/documents/", documents_router)
@@ -0,0 +1,11 @@
+import orjson
+from ninja.renderers import BaseRenderer
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson, which serializes UUIDs and datetimes natively"""
+
+    media_type = "application/json"
+
+    def render(self, request, data, *, response_status):
+        return orjson.dumps(data)
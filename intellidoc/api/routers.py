@@ -1,18 +1,48 @@
+from django.shortcuts import get_object_or_404
 from ninja import Router
+from ninja.pagination import LimitOffsetPagination, paginate
+from ninja.security import django_auth
 
-documents_router = Router()
-chat_router = Router()
+from chat.models import Message
+from documents.models import Document
+from .schemas import DocumentOut, MessageOut
+
+documents_router = Router(auth=django_auth)
+chat_router = Router(auth=django_auth)
 auth_router = Router()
 
-# Example routes
-@documents_router.get("/test")
-def test_documents(request):
-    return {"message": "Documents API working"}
+# Read endpoints return .values() rows validated straight into the schemas
+DOCUMENT_FIELDS = tuple(DocumentOut.model_fields)
+MESSAGE_FIELDS = tuple(MessageOut.model_fields)
+
 
-@chat_router.get("/test")
-def test_chat(request):
-    return {"message": "Chat API working"}
+@documents_router.get("/", response=list[DocumentOut])
+@paginate(LimitOffsetPagination)
+def list_documents(request):
+    return (
+        Document.objects.active().filter(owner=request.user)
+        .order_by("-uploaded_at")
+        .values(*DOCUMENT_FIELDS)
+    )
 
+@documents_router.get("/{uuid:document_id}", response=DocumentOut)
+def get_document(request, document_id):
+    return get_object_or_404(
+        Document.objects.active().values(*DOCUMENT_FIELDS), id=document_id, owner=request.user
+    )
+
+@chat_router.get("/conversations/{uuid:conversation_id}/messages", response=list[MessageOut])
+@paginate(LimitOffsetPagination)
+def list_messages(request, conversation_id):
+    return (
+        Message.objects.filter(
+            conversation_id=conversation_id, conversation__user=request.user
+        )
+        .order_by("created_at")
+        .values(*MESSAGE_FIELDS)
+    )
+
+# Example routes
 @auth_router.get("/test")
 def test_auth(request):
     return {"message": "Auth API working"}
@@ -0,0 +1,21 @@
+# api/schemas.py
+from datetime import datetime
+from uuid import UUID
+
+from ninja import Schema
+
+
+class DocumentOut(Schema):
+    id: UUID
+    title: str
+    file_type: str
+    file_size: int
+    uploaded_at: datetime
+
+
+class MessageOut(Schema):
+    id: UUID
+    conversation_id: UUID
+    role: str
+    content: str
+    created_at: datetime
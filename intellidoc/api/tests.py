@@ -1,3 +1,108 @@
+import orjson
+
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import User
+from chat.models import Conversation, Message
+from documents.models import Document
+
+
+def make_documents(owner, count, **fields):
+    # bulk_create skips the pre_save hook that stats the uploaded file
+    return Document.objects.bulk_create([
+        Document(
+            owner=owner, title=f"doc {i}", file=f"documents/{i}.txt",
+            file_type="txt", file_size=10, status="ready", **fields
+        )
+        for i in range(count)
+    ])
+
+
+class NinjaListQueryTests(TestCase):
+    """List endpoints read .values() rows, so their query count is independent of page size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="api@example.com", password="pw")
+        cls.conversation = Conversation.objects.create(user=cls.user, title="chat")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def assertConstantQueries(self, url, add_rows):
+        add_rows(2)
+        with self.assertNumQueries(4) as small:  # session, user, count, page
+            self.assertEqual(self.client.get(url).status_code, 200)
+        add_rows(20)
+        with self.assertNumQueries(len(small.captured_queries)):
+            response = self.client.get(url)
+        self.assertEqual(response.json()["count"], 22)
+
+    def test_list_documents(self):
+        self.assertConstantQueries(
+            "/api/documents/", lambda n: make_documents(self.user, n)
+        )
+
+    def test_list_messages(self):
+        self.assertConstantQueries(
+            f"/api/chat/conversations/{self.conversation.pk}/messages",
+            lambda n: Message.objects.bulk_create([
+                Message(conversation=self.conversation, role="user", content=str(i))
+                for i in range(n)
+            ]),
+        )
+
+
+class NinjaPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="pages@example.com", password="pw")
+        make_documents(cls.user, 30)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_default_limit(self):
+        data = self.client.get("/api/documents/").json()
+        self.assertEqual(data["count"], 30)
+        self.assertEqual(len(data["items"]), 25)
+
+    def test_limit_offset(self):
+        data = self.client.get("/api/documents/?limit=10&offset=25").json()
+        self.assertEqual(len(data["items"]), 5)
+
+    def test_limit_above_max_rejected(self):
+        response = self.client.get("/api/documents/?limit=101")
+        self.assertEqual(response.status_code, 422)
+
+
+class NinjaRendererTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="render@example.com", password="pw")
+        [cls.document] = make_documents(cls.user, 1)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_document_detail_rendered_with_orjson(self):
+        response = self.client.get(f"/api/documents/{self.document.pk}")
+        self.assertTrue(response["Content-Type"].startswith("application/json"))
+        self.assertEqual(
+            orjson.loads(response.content),
+            {
+                "id": str(self.document.pk),
+                "title": "doc 0",
+                "file_type": "txt",
+                "file_size": 10,
+                "uploaded_at": self.document.uploaded_at.isoformat(),
+            },
+        )
+
+    def test_other_users_document_not_found(self):
+        other = User.objects.create_user(email="other@example.com", password="pw")
+        self.client.force_login(other)
+        response = self.client.get(f"/api/documents/{self.document.pk}")
+        self.assertEqual(response.status_code, 404)
@@ -1,12 +0,0 @@
-from rest_framework import viewsets
-from documents.models import Document
-from chat.models import Message
-from .serializers import DocumentSerializer, MessageSerializer
-
-class DocumentViewSet(viewsets.ModelViewSet):
-    queryset = Document.objects.all().order_by('-uploaded_at')
-    serializer_class = DocumentSerializer
-
-class MessageViewSet(viewsets.ModelViewSet):
-    queryset = Message.objects.all().order_by('-timestamp')
-    serializer_class = MessageSerializer
@@ -1,14 +1,34 @@
 # chat/consumers.py - WEBSOCKET CONSUMER
 
-import json
 import logging
+
+import orjson
 from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
-from django.utils import timezone
+from django.core.cache import cache
+from django.db import IntegrityError
 
 logger = logging.getLogger('intellidoc.chat')
 
 
+def _dumps(obj):
+    # Channels expects text frames as str
+    return orjson.dumps(obj).decode()
+
+
+# Pings arrive every few seconds per connection; only the timestamp varies
+PONG_TEMPLATE = '{"type":"pong","timestamp":%s}'
+
+
+def chat_message_event(message):
+    """Channel layer event carrying a chat message frame encoded once for all receivers"""
+    return {
+        "type": "chat.raw",
+        "payload": _dumps({"type": "chat_message", "message": message.to_payload()}),
+    }
+
+
 class NotificationConsumer(AsyncWebsocketConsumer):
     """WebSocket consumer for real-time notifications"""
 
@@ -32,31 +52,27 @@ class NotificationConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data):
         """Handle messages from WebSocket"""
         try:
-            data = json.loads(text_data)
+            data = orjson.loads(text_data)
             if data.get("type") == "ping":
-                await self.send(
-                    text_data=json.dumps(
-                        {"type": "pong", "timestamp": data.get("timestamp")}
-                    )
-                )
-        except json.JSONDecodeError:
+                await self.send(text_data=PONG_TEMPLATE % _dumps(data.get("timestamp")))
+        except orjson.JSONDecodeError:
             logger.error(f"Invalid JSON received from user {self.user_id}")
 
     async def document_processing_update(self, event):
         await self.send(
-            text_data=json.dumps(
+            text_data=_dumps(
                 {"type": "document_processing_update", "message": event["message"]}
             )
         )
 
     async def chat_response(self, event):
         await self.send(
-            text_data=json.dumps({"type": "chat_response", "message": event["message"]})
+            text_data=_dumps({"type": "chat_response", "message": event["message"]})
         )
 
     async def system_notification(self, event):
         await self.send(
-            text_data=json.dumps(
+            text_data=_dumps(
                 {"type": "system_notification", "message": event["message"]}
             )
         )
@@ -84,10 +100,10 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data):
         """Handle chat messages"""
         try:
-            data = json.loads(text_data)
+            data = orjson.loads(text_data)
             if data.get("type") == "chat_message":
                 await self.handle_chat_message(data)
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error(f"Invalid JSON received for conversation {self.conversation_id}")
 
     async def handle_chat_message(self, data):
@@ -96,60 +112,53 @@ class ChatConsumer(AsyncWebsocketConsumer):
         if not message_content:
             return
 
-        # Save user message
+        # Persist first so every client sees the stored row, then hand the reply to a worker
         user_msg = await self.save_message(role="user", content=message_content)
-        if user_msg:
-            await self.channel_layer.group_send(
-                self.group_name,
-                {"type": "chat_message_broadcast", "message": user_msg},
-            )
+        if user_msg is None:
+            return
 
-        # Placeholder AI response (Phase 2: replace with actual LLM call)
-        ai_response = (
-            "I'm processing your question about the documents. "
-            "Full AI integration coming in Phase 2! 🤖"
-        )
-        ai_msg = await self.save_message(role="assistant", content=ai_response)
-        if ai_msg:
-            await self.channel_layer.group_send(
-                self.group_name,
-                {"type": "chat_message_broadcast", "message": ai_msg},
-            )
+        await self.channel_layer.group_send(self.group_name, chat_message_event(user_msg))
+        await self.queue_ai_response(user_msg)
 
-    async def chat_message_broadcast(self, event):
-        """Broadcast chat message to WebSocket"""
-        await self.send(
-            text_data=json.dumps({"type": "chat_message", "message": event["message"]})
-        )
+    async def chat_raw(self, event):
+        """Forward a pre-encoded chat frame to the WebSocket"""
+        await self.send(text_data=event["payload"])
 
     @database_sync_to_async
     def can_access_conversation(self):
         """Check if user can access conversation"""
         from .models import Conversation
-
-        try:
-            conversation = Conversation.objects.get(id=self.conversation_id)
-            return conversation.user == self.scope["user"]
-        except Conversation.DoesNotExist:
-            return False
+        from .signals import CONVERSATION_OWNER_KEY, CONVERSATION_OWNER_TIMEOUT
+
+        owner_id = cache.get_or_set(
+            CONVERSATION_OWNER_KEY.format(conversation_id=self.conversation_id),
+            lambda: Conversation.objects.filter(id=self.conversation_id)
+            .values_list("user_id", flat=True)
+            .first(),
+            timeout=CONVERSATION_OWNER_TIMEOUT,
+        )
+        user = self.scope["user"]
+        return owner_id is not None and user.is_authenticated and owner_id == user.id
 
     @database_sync_to_async
     def save_message(self, role, content):
-        """Save message to database and return dict"""
+        """Save a message and bump conversation activity; None if it could not be stored"""
         from .models import Conversation, Message
 
         try:
-            conversation = Conversation.objects.get(id=self.conversation_id)
             message = Message.objects.create(
-                conversation=conversation, role=role, content=content
+                conversation_id=self.conversation_id,
+                role=role,
+                content=content,
             )
-            conversation.update_activity()
-            return {
-                "id": str(message.id),
-                "role": message.role,
-                "content": message.content,
-                "created_at": message.created_at.isoformat(),
-            }
-        except Conversation.DoesNotExist:
-            logger.error(f"Conversation {self.conversation_id} not found")
+        except IntegrityError:
+            logger.exception(f"Could not save message for conversation {self.conversation_id}")
             return None
+        Conversation(pk=self.conversation_id).update_activity(new_messages=1)
+        return message
+
+    @sync_to_async
+    def queue_ai_response(self, message):
+        from .tasks import generate_ai_response
+
+        generate_ai_response.delay(str(self.conversation_id), str(message.id))
@@ -3,9 +3,13 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from documents.models import Document
 
+# Minimum seconds between last_message_at writes for one conversation
+ACTIVITY_DEBOUNCE = 10
+
 class Conversation(models.Model):
     """Chat conversation with documents"""
     
@@ -23,6 +27,9 @@ class Conversation(models.Model):
     is_pinned = models.BooleanField(default=False)
     is_shared = models.BooleanField(default=False)
     
+    # Denormalized counter, kept in step by update_activity()
+    message_count = models.PositiveIntegerField(default=0)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -37,13 +44,16 @@ class Conversation(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.title}"
     
-    @property
-    def message_count(self):
-        return self.messages.count()
-    
-    def update_activity(self):
-        self.last_message_at = timezone.now()
-        self.save(update_fields=['last_message_at'])
+    def update_activity(self, new_messages=0):
+        values = {}
+        if new_messages:
+            values['message_count'] = models.F('message_count') + new_messages
+        # last_message_at is bumped at most once per ACTIVITY_DEBOUNCE seconds
+        if cache.add(f"conv_touch:{self.pk}", 1, timeout=ACTIVITY_DEBOUNCE):
+            self.last_message_at = timezone.now()
+            values['last_message_at'] = self.last_message_at
+        if values:
+            Conversation.objects.filter(pk=self.pk).update(**values)
 
 class Message(models.Model):
     """Individual messages in conversations"""
@@ -79,8 +89,17 @@ class Message(models.Model):
     class Meta:
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['conversation', 'created_at']),
+            models.Index(fields=['conversation', 'created_at', 'id'], name='msg_conv_created_id_idx'),
         ]
     
     def __str__(self):
-        return f"{self.role}: {self.content[:50]}..."
\ No newline at end of file
+        return f"{self.role}: {self.content[:50]}..."
+    
+    def to_payload(self):
+        """JSON-ready dict broadcast to chat WebSocket clients"""
+        return {
+            "id": str(self.id),
+            "role": self.role,
+            "content": self.content,
+            "created_at": self.created_at.isoformat(),
+        }
@@ -0,0 +1,15 @@
+# chat/signals.py
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Conversation
+
+# conversation_id -> owner_id, read by ChatConsumer on every WebSocket connect
+CONVERSATION_OWNER_KEY = "conv_owner:{conversation_id}"
+CONVERSATION_OWNER_TIMEOUT = 3600  # seconds
+
+
+@receiver([post_save, post_delete], sender=Conversation)
+def invalidate_conversation_owner(sender, instance, **kwargs):
+    cache.delete(CONVERSATION_OWNER_KEY.format(conversation_id=instance.pk))
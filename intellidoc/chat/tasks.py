@@ -0,0 +1,31 @@
+# chat/tasks.py
+import logging
+from celery import shared_task
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+
+from .consumers import chat_message_event
+from .models import Conversation, Message
+
+logger = logging.getLogger('intellidoc.tasks')
+channel_layer = get_channel_layer()
+
+@shared_task
+def generate_ai_response(conversation_id: str, user_message_id: str):
+    """Generate the assistant reply to a chat message and push it to the conversation"""
+    
+    # Placeholder AI response (Phase 2: replace with actual LLM call)
+    ai_response = (
+        "I'm processing your question about the documents. "
+        "Full AI integration coming in Phase 2! 🤖"
+    )
+    
+    message = Message.objects.create(
+        conversation_id=conversation_id,
+        role='assistant',
+        content=ai_response,
+    )
+    Conversation(pk=conversation_id).update_activity(new_messages=1)
+    
+    async_to_sync(channel_layer.group_send)(f"chat_{conversation_id}", chat_message_event(message))
+    logger.info(f"Generated AI response for message {user_message_id}")
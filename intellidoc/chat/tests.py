@@ -1,3 +1,210 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from documents.models import Document
+from .consumers import ChatConsumer
+from .models import Conversation, Message
+from .views import MESSAGES_PAGE_SIZE
+
+
+def make_messages(conversation, count):
+    """Messages one second apart, oldest first"""
+    messages = Message.objects.bulk_create([
+        Message(conversation=conversation, role='user', content=f"message {i}")
+        for i in range(count)
+    ])
+    start = timezone.now() - timedelta(seconds=count)
+    for i, message in enumerate(messages):
+        message.created_at = start + timedelta(seconds=i)
+        Message.objects.filter(pk=message.pk).update(created_at=message.created_at)
+    return messages
+
+
+class MessageHistoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="chat@example.com", password="pw")
+        cls.conversation = Conversation.objects.create(user=cls.user, title="chat")
+        cls.messages = make_messages(cls.conversation, MESSAGES_PAGE_SIZE + 5)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def messages_before(self, **params):
+        url = reverse('chat:messages_before', kwargs={'pk': self.conversation.pk})
+        return self.client.get(url, params)
+
+    def test_list_renders_latest_page_with_load_older(self):
+        response = self.client.get(reverse('chat:list'))
+        self.assertEqual(response.status_code, 200)
+        shown = response.context['chat_messages']
+        self.assertEqual(shown, self.messages[-MESSAGES_PAGE_SIZE:])
+        self.assertContains(response, "Load older messages")
+        self.assertContains(response, f"before_id={shown[0].id}")
+
+    def test_full_page_leads_with_next_cursor(self):
+        newest = self.messages[-1]
+        response = self.messages_before(
+            before=newest.created_at.isoformat(), before_id=newest.id
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "message 4<")
+        self.assertNotContains(response, "message 3<")
+        self.assertContains(response, f"before_id={self.messages[4].id}")
+
+    def test_last_page_has_no_load_older(self):
+        oldest_shown = self.messages[-MESSAGES_PAGE_SIZE]
+        response = self.messages_before(
+            before=oldest_shown.created_at.isoformat(), before_id=oldest_shown.id
+        )
+        self.assertContains(response, "message 4")
+        self.assertNotContains(response, "message 5<")
+        self.assertNotContains(response, "Load older messages")
+
+    def test_invalid_cursor_rejected(self):
+        for params in (
+            {},
+            {'before': 'yesterday', 'before_id': self.messages[0].id},
+            {'before': '2024-13-01T00:00:00', 'before_id': self.messages[0].id},
+            {'before': timezone.now().isoformat(), 'before_id': 'not-a-uuid'},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.messages_before(**params).status_code, 400)
+
+    def test_other_users_conversation_not_found(self):
+        other = User.objects.create_user(email="other@example.com", password="pw")
+        self.client.force_login(other)
+        response = self.messages_before(
+            before=timezone.now().isoformat(), before_id=self.messages[0].id
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class ChatConsumerTests(TransactionTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="ws@example.com", password="pw")
+        self.conversation = Conversation.objects.create(user=self.user, title="chat")
+
+    async def connect(self):
+        communicator = WebsocketCommunicator(
+            ChatConsumer.as_asgi(), f"/ws/chat/{self.conversation.pk}/"
+        )
+        communicator.scope["user"] = self.user
+        communicator.scope["url_route"] = {"kwargs": {"conversation_id": str(self.conversation.pk)}}
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    @patch('chat.tasks.generate_ai_response.delay')
+    def test_message_broadcast_from_saved_row(self, delay):
+        async def run():
+            communicator = await self.connect()
+            await communicator.send_json_to({"type": "chat_message", "message": " hello "})
+            frame = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return frame
+
+        frame = async_to_sync(run)()
+        saved = Message.objects.get()
+        self.assertEqual(frame, {"type": "chat_message", "message": saved.to_payload()})
+        self.assertEqual(saved.content, "hello")
+        delay.assert_called_once_with(str(self.conversation.pk), str(saved.pk))
+
+    @patch('chat.tasks.generate_ai_response.delay')
+    def test_nothing_broadcast_when_save_fails(self, delay):
+        async def run():
+            communicator = await self.connect()
+            # The owner check is cached, so the socket outlives the conversation
+            await database_sync_to_async(self.conversation.delete)()
+            await communicator.send_json_to({"type": "chat_message", "message": "hello"})
+            silent = await communicator.receive_nothing()
+            await communicator.disconnect()
+            return silent
+
+        with self.assertLogs('intellidoc.chat', 'ERROR') as logs:
+            self.assertTrue(async_to_sync(run)())
+        self.assertIn("Could not save message", logs.output[0])
+        self.assertFalse(Message.objects.exists())
+        delay.assert_not_called()
+
+
+class ConversationPinTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="pin@example.com", password="pw")
+        cls.conversation = Conversation.objects.create(user=cls.user, title="chat")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('chat:pin', kwargs={'pk': self.conversation.pk})
+
+    def test_toggle_flips_and_reports_state(self):
+        with self.assertNumQueries(3):  # session, user, UPDATE ... RETURNING
+            data = self.client.post(self.url).json()
+        self.assertEqual(data['is_pinned'], True)
+        self.conversation.refresh_from_db()
+        self.assertTrue(self.conversation.is_pinned)
+
+        data = self.client.post(self.url).json()
+        self.assertEqual(data, {'success': True, 'is_pinned': False, 'message': '📌 Unpinned'})
+        self.conversation.refresh_from_db()
+        self.assertFalse(self.conversation.is_pinned)
+
+    def test_other_users_conversation_not_found(self):
+        other = User.objects.create_user(email="other@example.com", password="pw")
+        self.client.force_login(other)
+        self.assertEqual(self.client.post(self.url).status_code, 404)
+        self.conversation.refresh_from_db()
+        self.assertFalse(self.conversation.is_pinned)
+
+
+class BulkAddDocumentsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="docs@example.com", password="pw")
+        cls.other = User.objects.create_user(email="other@example.com", password="pw")
+        cls.conversation = Conversation.objects.create(user=cls.user, title="chat")
+        # bulk_create skips the pre_save hook that stats the uploaded file
+        cls.ready, cls.pending, cls.foreign = Document.objects.bulk_create([
+            Document(owner=owner, title=title, file=f"documents/{title}.txt",
+                     file_type="txt", file_size=1, status=status)
+            for owner, title, status in (
+                (cls.user, "ready", "ready"),
+                (cls.user, "pending", "processing"),
+                (cls.other, "foreign", "ready"),
+            )
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('chat:bulk_add_documents', kwargs={'pk': self.conversation.pk})
+
+    def test_adds_only_own_ready_documents(self):
+        response = self.client.post(self.url, {
+            'document_ids': [self.ready.pk, self.pending.pk, self.foreign.pk, 'not-a-uuid'],
+        })
+        self.assertEqual(response.json()['added'], 1)
+        self.assertQuerySetEqual(self.conversation.documents.all(), [self.ready])
+
+    def test_nothing_valid_is_not_found(self):
+        response = self.client.post(self.url, {'document_ids': [self.foreign.pk]})
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(self.conversation.documents.exists())
+
+    def test_other_users_conversation_not_found(self):
+        self.client.force_login(self.other)
+        response = self.client.post(self.url, {'document_ids': [self.foreign.pk]})
+        self.assertEqual(response.status_code, 404)
@@ -10,5 +10,7 @@ urlpatterns = [
     path('<uuid:pk>/', views.ConversationDetailView.as_view(), name='detail'),
     path('<uuid:pk>/pin/', views.conversation_toggle_pin, name='pin'),
     path('<uuid:pk>/add-document/', views.add_document_to_conversation, name='add_document'),
-    path("<int:pk>/message/", views.chat_message, name="chat_message"), # HTMX -> returns rendered snippet
+    path('<uuid:pk>/documents/bulk-add/', views.bulk_add_documents_to_conversation, name='bulk_add_documents'),
+    path('<uuid:pk>/messages/', views.messages_before, name='messages_before'),  # HTMX infinite scroll
+    path("<uuid:pk>/message/", views.chat_message, name="chat_message"), # HTMX -> returns rendered snippet
 ]
@@ -1,20 +1,49 @@
 # chat/views.py
+import uuid
+from functools import lru_cache
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
+from django.db import connection
+from django.db.models import Q
 from django.views.generic import ListView, CreateView, DetailView
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse, HttpResponseBadRequest
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_POST
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 
 from .models import Conversation, Message
 from .forms import ConversationForm
 from documents.models import Document
 
 
+# Messages loaded per page when opening a conversation or scrolling back
+MESSAGES_PAGE_SIZE = 50
+
+
+def latest_messages(queryset):
+    """Newest page of messages by (created_at, id) keyset, in chronological order"""
+    page = list(queryset.order_by('-created_at', '-id')[:MESSAGES_PAGE_SIZE])
+    page.reverse()
+    return page
+
+
+@lru_cache(maxsize=1)
+def _message_template():
+    """Message snippet returned to HTMX after every chat POST"""
+    return get_template("chat/message.html")
+
+
+@lru_cache(maxsize=1)
+def _load_older_template():
+    """Button that fetches the page before the given oldest message"""
+    return get_template("chat/load_older.html")
+
+
 class ConversationListView(LoginRequiredMixin, ListView):
     """Show user’s conversations + load first chat by default."""
     model = Conversation
@@ -23,19 +52,25 @@ class ConversationListView(LoginRequiredMixin, ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        return Conversation.objects.filter(user=self.request.user).order_by("-last_message_at")
+        return (
+            Conversation.objects.filter(user=self.request.user)
+            .order_by("-last_message_at")
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        qs = list(self.get_queryset())
-        recent_chats = qs
+        # Reuse the page ListView already fetched instead of re-running the query
+        recent_chats = list(context['conversations'])
         current_chat = recent_chats[0] if recent_chats else None
 
+        chat_messages = latest_messages(current_chat.messages.all()) if current_chat else []
+
         context.update({
             'recent_chats': recent_chats,
             'current_chat': current_chat,
-            'chat_messages': current_chat.messages.all().order_by('created_at') if current_chat else [],
-            'user_documents': Document.objects.filter(owner=self.request.user),
+            'chat_messages': chat_messages,
+            'has_older_messages': len(chat_messages) == MESSAGES_PAGE_SIZE,
+            'user_documents': Document.objects.filter(owner=self.request.user).only('id', 'title'),
         })
         return context
 
@@ -77,51 +112,90 @@ class ConversationDetailView(LoginRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['messages'] = self.object.messages.all().order_by('created_at')
-        context['available_documents'] = Document.objects.filter(
+        # Newest page only; the load-older control pages back through messages_before
+        context['messages'] = latest_messages(self.object.messages.all())
+        context['has_older_messages'] = len(context['messages']) == MESSAGES_PAGE_SIZE
+        # The picker only renders id and title
+        context['available_documents'] = list(Document.objects.filter(
             owner=self.request.user,
             status='ready'
-        )
+        ).values('id', 'title').order_by('title'))
         return context
 
 
 @login_required
 def conversation_toggle_pin(request, pk):
     """Toggle conversation pin status"""
-    conversation = get_object_or_404(Conversation, pk=pk, user=request.user)
-
-    conversation.is_pinned = not conversation.is_pinned
-    conversation.save(update_fields=['is_pinned'])
+    # One UPDATE ... RETURNING flips the flag and reads the new value back
+    table = connection.ops.quote_name(Conversation._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET is_pinned = NOT is_pinned "
+            "WHERE id = %s AND user_id = %s RETURNING is_pinned",
+            [Conversation._meta.pk.get_db_prep_value(pk, connection), request.user.pk],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        raise Http404("No Conversation matches the given query.")
+    is_pinned = bool(row[0])
 
     return JsonResponse({
         'success': True,
-        'is_pinned': conversation.is_pinned,
-        'message': '📌 Pinned' if conversation.is_pinned else '📌 Unpinned'
+        'is_pinned': is_pinned,
+        'message': '📌 Pinned' if is_pinned else '📌 Unpinned'
     })
 
 
 @login_required
+@require_POST
 def add_document_to_conversation(request, pk):
     """Add document to conversation context"""
     conversation = get_object_or_404(Conversation, pk=pk, user=request.user)
 
-    if request.method == 'POST':
-        document_id = request.POST.get('document_id')
+    document_id = request.POST.get('document_id')
+    # Only the title is needed; link by pk instead of loading the Document
+    title = Document.objects.filter(
+        id=document_id,
+        owner=request.user,
+        status='ready'
+    ).values_list('title', flat=True).first()
+    if title is None:
+        return JsonResponse({'success': False, 'message': 'Document not found'}, status=404)
+
+    conversation.documents.add(document_id)
+    return JsonResponse({
+        'success': True,
+        'message': f'Added {title} to conversation'
+    })
+
+
+@login_required
+@require_POST
+def bulk_add_documents_to_conversation(request, pk):
+    """Add several documents to conversation context in one request"""
+    conversation = get_object_or_404(Conversation, pk=pk, user=request.user)
+
+    document_ids = []
+    for value in request.POST.getlist('document_ids'):
         try:
-            document = Document.objects.get(
-                id=document_id,
-                owner=request.user,
-                status='ready'
-            )
-            conversation.documents.add(document)
-            return JsonResponse({
-                'success': True,
-                'message': f'Added {document.title} to conversation'
-            })
-        except Document.DoesNotExist:
-            return JsonResponse({'success': False, 'message': 'Document not found'}, status=404)
-
-    return JsonResponse({'success': False}, status=405)
+            document_ids.append(uuid.UUID(value))
+        except ValueError:
+            continue
+
+    valid_ids = list(Document.objects.filter(
+        id__in=document_ids,
+        owner=request.user,
+        status='ready'
+    ).values_list('id', flat=True))
+    if not valid_ids:
+        return JsonResponse({'success': False, 'message': 'Document not found'}, status=404)
+
+    conversation.documents.add(*valid_ids)
+    return JsonResponse({
+        'success': True,
+        'added': len(valid_ids),
+        'message': f'Added {len(valid_ids)} documents to conversation'
+    })
 
 
 @login_required
@@ -137,10 +211,37 @@ def chat_message(request, pk):
             role='user',
             content=content
         )
-        conversation.update_activity()
+        conversation.update_activity(new_messages=1)
 
         # Render only the new message block
-        html = render_to_string("chat/message.html", {"message": message}, request=request)
+        html = _message_template().render({"message": message}, request=request)
         return HttpResponse(html)
 
     return HttpResponse("")
+
+
+@login_required
+def messages_before(request, pk):
+    """HTMX load-older: render the page of messages older than the given cursor."""
+    conversation = get_object_or_404(Conversation, pk=pk, user=request.user)
+
+    try:
+        before = parse_datetime(request.GET.get('before', ''))
+        before_id = uuid.UUID(request.GET.get('before_id', ''))
+    except ValueError:
+        before = None
+    if before is None:
+        return HttpResponseBadRequest("before must be an ISO datetime and before_id a UUID")
+
+    page = latest_messages(conversation.messages.filter(
+        Q(created_at__lt=before) | Q(created_at=before, id__lt=before_id)
+    ))
+
+    template = _message_template()
+    html = "".join(template.render({"message": message}, request=request) for message in page)
+    if len(page) == MESSAGES_PAGE_SIZE:
+        # A full page may have older ones behind it: lead with a button for the next cursor
+        html = _load_older_template().render(
+            {"conversation": conversation, "oldest": page[0]}, request=request
+        ) + html
+    return HttpResponse(html)
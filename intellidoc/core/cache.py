@@ -0,0 +1,39 @@
+# core/cache.py
+from django.core.cache import cache
+
+# Per-user caches for the profile and dashboard pages. Keys embed a per-user
+# version counter, so bumping the version invalidates every cached page at once.
+STATS_VERSION_KEY = "dashver:{user_id}"
+DASHBOARD_STATS_KEY = "dashboard:{user_id}:{version}"
+PROFILE_STATS_KEY = "profile:{user_id}:{version}"
+CORE_DASHBOARD_KEY = "core_dashboard:{user_id}:{version}"
+USER_COLLECTIONS_KEY = "collections:{user_id}:{version}"
+STATS_CACHE_TIMEOUT = 300  # seconds
+# Search results use their own version, bumped only when searchable content changes
+SEARCH_VERSION_KEY = "searchver:{user_id}"
+SEARCH_RESULTS_KEY = "search:{user_id}:{version}:{digest}"
+SEARCH_CACHE_TIMEOUT = 600  # seconds
+
+
+def stats_version(user_id):
+    """Current stats cache version for a user"""
+    return cache.get_or_set(STATS_VERSION_KEY.format(user_id=user_id), 1, timeout=None)
+
+
+def bump_stats_version(user_id):
+    """Invalidate a user's cached stats, e.g. after a bulk queryset update"""
+    key = STATS_VERSION_KEY.format(user_id=user_id)
+    cache.add(key, 1, timeout=None)
+    cache.incr(key)
+
+
+def search_version(user_id):
+    """Current search cache version for a user"""
+    return cache.get_or_set(SEARCH_VERSION_KEY.format(user_id=user_id), 1, timeout=None)
+
+
+def bump_search_version(user_id):
+    """Invalidate a user's cached search results"""
+    key = SEARCH_VERSION_KEY.format(user_id=user_id)
+    cache.add(key, 1, timeout=None)
+    cache.incr(key)
@@ -1,3 +1,69 @@
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import User
+from documents.models import Document, DocumentCollection
+from .cache import bump_search_version, bump_stats_version, search_version, stats_version
+
+
+class StatsVersionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="cache@example.com", password="pw")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_changes_version(self):
+        before = stats_version(self.user.pk)
+        bump_stats_version(self.user.pk)
+        self.assertEqual(stats_version(self.user.pk), before + 1)
+
+    def test_bump_before_first_read(self):
+        bump_stats_version(self.user.pk)
+        self.assertEqual(stats_version(self.user.pk), 2)
+
+    def test_owner_changes_bump_version(self):
+        before = stats_version(self.user.pk)
+        collection = DocumentCollection.objects.create(owner=self.user, name="papers")
+        after_create = stats_version(self.user.pk)
+        self.assertGreater(after_create, before)
+        collection.delete()
+        self.assertGreater(stats_version(self.user.pk), after_create)
+
+
+class SearchVersionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="search@example.com", password="pw")
+
+    def setUp(self):
+        cache.clear()
+        # bulk_create skips the pre_save hook that stats the uploaded file
+        [self.document] = Document.objects.bulk_create([Document(
+            owner=self.user, title="doc", file="documents/doc.txt",
+            file_type="txt", file_size=1, status="processing",
+        )])
+
+    def test_bump_changes_version(self):
+        before = search_version(self.user.pk)
+        bump_search_version(self.user.pk)
+        self.assertEqual(search_version(self.user.pk), before + 1)
+
+    def test_status_save_bumps_version(self):
+        before = search_version(self.user.pk)
+        self.document.status = "ready"
+        self.document.save(update_fields=["status"])
+        self.assertEqual(search_version(self.user.pk), before + 1)
+
+    def test_counter_save_keeps_version(self):
+        before = search_version(self.user.pk)
+        self.document.save(update_fields=["view_count"])
+        self.assertEqual(search_version(self.user.pk), before)
+
+    def test_delete_bumps_version(self):
+        before = search_version(self.user.pk)
+        self.document.delete()
+        self.assertEqual(search_version(self.user.pk), before + 1)
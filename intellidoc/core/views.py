@@ -1,12 +1,17 @@
 # intellidoc/core/views.py
+from functools import lru_cache
+
 from django.views.generic import TemplateView
 from django.shortcuts import redirect
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
 from django.views.generic.base import RedirectView
 from django.apps import apps
+from django.core.cache import cache
+from django.db.models import Count
 from django.urls import reverse
-from django.views.generic import TemplateView
+
+from .cache import CORE_DASHBOARD_KEY, STATS_CACHE_TIMEOUT, stats_version
 
 
 class HomeView(TemplateView):
@@ -37,6 +42,47 @@ class PricingView(TemplateView):
     template_name = 'core/pricing.html'
 
 
+@lru_cache(maxsize=1)
+def _dashboard_models():
+    """
+    Resolve the dashboard models and their owner field once, on first use
+    (safe if apps not yet implemented).
+    """
+    def safe_model(app_label, model_name):
+        try:
+            return apps.get_model(app_label, model_name)
+        except Exception:
+            return None
+
+    def owner_field(Model):
+        if not Model:
+            return None
+        # prefer owner, else user foreign key
+        field_names = {f.name for f in Model._meta.fields}
+        if 'owner' in field_names:
+            return 'owner'
+        if 'user' in field_names:
+            return 'user'
+        return None
+
+    def chunks_lookup(DocumentChunk):
+        # reverse lookup from Document to its chunks, for aggregating counts
+        if not DocumentChunk:
+            return None
+        try:
+            return DocumentChunk._meta.get_field('document').related_query_name()
+        except Exception:
+            return None
+
+    Document = safe_model('documents', 'Document')
+    ChatSession = safe_model('chat', 'ChatSession') or safe_model('chat', 'Chat')
+    return {
+        'document': (Document, owner_field(Document)),
+        'chat': (ChatSession, owner_field(ChatSession)),
+        'chunks_lookup': chunks_lookup(safe_model('documents', 'DocumentChunk')),
+    }
+
+
 @method_decorator(login_required, name='dispatch')
 class DashboardView(TemplateView):
     """
@@ -51,58 +97,58 @@ class DashboardView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        user = self.request.user
 
-        # Try to resolve models dynamically (safe if apps not yet implemented)
-        def safe_model(app_label, model_name):
-            try:
-                return apps.get_model(app_label, model_name)
-            except Exception:
-                return None
-
-        Document = safe_model('documents', 'Document')
-        DocumentChunk = safe_model('documents', 'DocumentChunk')
-        ChatSession = safe_model('chat', 'ChatSession') or safe_model('chat', 'Chat')
+        # Stats and recent documents, cached until the user's documents or chats change
+        context.update(cache.get_or_set(
+            CORE_DASHBOARD_KEY.format(user_id=user.id, version=stats_version(user.id)),
+            lambda: self.get_dashboard_data(user),
+            STATS_CACHE_TIMEOUT,
+        ))
+        return context
 
-        user = self.request.user
+    def get_dashboard_data(self, user):
+        context = {}
+        models = _dashboard_models()
 
-        # If the models exist, scope them to the current user if owner exists
-        def scoped_qs(Model):
+        # Scope each resolved model to the current user via its owner field
+        def scoped_qs(Model, owner_field):
             if not Model:
                 return None
-            # attempt common owner field name
-            if hasattr(Model, 'objects'):
-                qs = Model.objects.all()
-                if hasattr(Model, 'owner') or hasattr(Model, 'user'):
-                    # prefer owner, else user foreign key
-                    if 'owner' in [f.name for f in Model._meta.fields]:
-                        qs = qs.filter(owner=user)
-                    elif 'user' in [f.name for f in Model._meta.fields]:
-                        qs = qs.filter(user=user)
-                return qs
-            return None
-
-        docs_qs = scoped_qs(Document) or []
-        chats_qs = scoped_qs(ChatSession) or []
-        chunks_qs = None
-        if DocumentChunk and docs_qs is not None:
-            try:
-                chunks_qs = DocumentChunk.objects.filter(document__in=docs_qs)
-            except Exception:
-                chunks_qs = None
+            qs = Model.objects.all()
+            if owner_field:
+                qs = qs.filter(**{owner_field: user})
+            return qs
+
+        Document, doc_owner = models['document']
+        ChatSession, chat_owner = models['chat']
+        chunks_lookup = models['chunks_lookup']
+
+        docs_qs = scoped_qs(Document, doc_owner)
+        chats_qs = scoped_qs(ChatSession, chat_owner)
+
+        # Documents and their chunks are counted in one aggregate query
+        counts = {'documents': 0, 'chunks': 0}
+        if docs_qs is not None:
+            aggregates = {'documents': Count('pk', distinct=True)}
+            if chunks_lookup:
+                aggregates['chunks'] = Count(chunks_lookup)
+            counts.update(docs_qs.aggregate(**aggregates))
 
         context['stats'] = {
-    'total_documents': docs_qs.count() if not isinstance(docs_qs, list) else len(docs_qs),
-    'total_chats': chats_qs.count() if not isinstance(chats_qs, list) else len(chats_qs),
-    'total_chunks': chunks_qs.count() if hasattr(chunks_qs, 'count') else (len(chunks_qs) if chunks_qs else 0),
-}
-
+            'total_documents': counts['documents'],
+            'total_chats': chats_qs.count() if chats_qs is not None else 0,
+            'total_chunks': counts['chunks'],
+        }
 
         # recent documents (limit to 9)
-        if hasattr(docs_qs, 'order_by'):
+        if docs_qs is not None:
             try:
-                context['recent_documents'] = docs_qs.order_by('-created_at')[:9]
+                context['recent_documents'] = list(docs_qs.only(
+                    'id', 'title', 'status', 'file_type', 'file_size', 'description', 'uploaded_at'
+                ).order_by('-uploaded_at')[:9])
             except Exception:
-                context['recent_documents'] = docs_qs[:9]
+                context['recent_documents'] = list(docs_qs[:9])
         else:
             context['recent_documents'] = []
 
@@ -2,6 +2,18 @@ from django import forms
 from django.core.exceptions import ValidationError
 from .models import Document, DocumentCollection, validate_file_type
 
+INPUT_CLASSES = 'w-full bg-gray-700 border border-gray-600 rounded-lg px-3 py-2 focus:outline-none focus:ring-2 focus:ring-blue-500'
+
+TITLE_ATTRS = {
+    'class': INPUT_CLASSES,
+    'placeholder': 'Enter document title'
+}
+DESCRIPTION_ATTRS = {
+    'class': INPUT_CLASSES,
+    'placeholder': 'Brief description of the document content...',
+    'rows': 3
+}
+
 
 class DocumentUploadForm(forms.ModelForm):
     """Form for uploading and validating documents"""
@@ -10,35 +22,16 @@ class DocumentUploadForm(forms.ModelForm):
         model = Document
         fields = ['title', 'description', 'file']
         widgets = {
-            'title': forms.TextInput(attrs={
-                'class': 'form-input',
-                'placeholder': 'Enter document title'
-            }),
-            'description': forms.Textarea(attrs={
-                'class': 'form-textarea',
-                'placeholder': 'Add an optional description',
-                'rows': 3
-            }),
+            'title': forms.TextInput(attrs=TITLE_ATTRS),
+            'description': forms.Textarea(attrs=DESCRIPTION_ATTRS),
             'file': forms.ClearableFileInput(attrs={
                 'class': 'form-file-input'
             })
         }
 
-    # In DocumentUploadForm.__init__:
     def __init__(self, *args, **kwargs):
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
-        
-        # Add proper CSS classes
-        self.fields['title'].widget.attrs.update({
-            'class': 'w-full bg-gray-700 border border-gray-600 rounded-lg px-3 py-2 focus:outline-none focus:ring-2 focus:ring-blue-500',
-            'placeholder': 'Enter document title'
-        })
-        self.fields['description'].widget.attrs.update({
-            'class': 'w-full bg-gray-700 border border-gray-600 rounded-lg px-3 py-2 focus:outline-none focus:ring-2 focus:ring-blue-500',
-            'placeholder': 'Brief description of the document content...',
-            'rows': 3
-        })
 
     def clean_title(self):
         title = self.cleaned_data.get('title')
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-15 09:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Covered by the (owner, status, -uploaded_at) prefix below
+        migrations.RemoveIndex(
+            model_name='document',
+            name='documents_d_owner_i_683479_idx',
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['owner', 'status', '-uploaded_at'], name='doc_owner_status_up_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['owner', '-query_count', '-view_count'], name='doc_owner_pop_idx'),
+        ),
+    ]
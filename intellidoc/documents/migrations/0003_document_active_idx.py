@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-15 09:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_document_owner_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('status', 'deleted'), _negated=True), fields=['owner', '-uploaded_at'], name='doc_active_idx'),
+        ),
+    ]
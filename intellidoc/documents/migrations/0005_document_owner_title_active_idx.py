@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-15 10:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_document_owner_status_pop_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('status__in', ['uploading', 'processing', 'ready'])), fields=['owner', 'title'], name='doc_owner_title_active_idx'),
+        ),
+    ]
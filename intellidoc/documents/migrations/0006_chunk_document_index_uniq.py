@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-15 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0005_document_owner_title_active_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='documentchunk',
+            name='documents_c_documen_0e3b68_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='documentchunk',
+            constraint=models.UniqueConstraint(fields=('document', 'chunk_index'), name='chunk_document_index_uniq'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-15 10:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0007_chunk_content_tsv'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['owner', 'status', '-last_accessed'], name='doc_owner_status_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('status__in', ['uploading', 'processing'])), fields=['uploaded_at'], name='doc_inflight_uploaded_idx'),
+        ),
+    ]
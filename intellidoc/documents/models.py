@@ -2,21 +2,33 @@ import os
 import uuid
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+ALLOWED_FILE_TYPES = ('.pdf', '.docx', '.doc', '.txt', '.md')
+_ALLOWED_EXTS = frozenset(ALLOWED_FILE_TYPES)
+_ALLOWED_EXTS_MSG = ", ".join(ALLOWED_FILE_TYPES)
 
 def validate_file_type(value):
     """Validate uploaded file type"""
-    allowed_types = ['.pdf', '.docx', '.doc', '.txt', '.md']
     ext = os.path.splitext(value.name)[1].lower()
-    if ext not in allowed_types:
-        raise ValidationError(f'File type {ext} not allowed. Allowed types: {", ".join(allowed_types)}')
+    if ext not in _ALLOWED_EXTS:
+        raise ValidationError(f'File type {ext} not allowed. Allowed types: {_ALLOWED_EXTS_MSG}')
 
 def document_upload_path(instance, filename):
     """Generate upload path for documents"""
-    ext = filename.split('.')[-1]
-    filename = f"{uuid.uuid4()}.{ext}"
-    return f"documents/{instance.owner.id}/{filename}"
+    ext = os.path.splitext(filename)[1].lower()
+    return f"documents/{instance.owner_id}/{uuid.uuid4()}{ext}"
+
+class DocumentQuerySet(models.QuerySet):
+    """Common Document filters"""
+    
+    def active(self):
+        """Documents that have not been soft-deleted"""
+        return self.exclude(status='deleted')
 
 class Document(models.Model):
     """Document model for uploaded files"""
@@ -41,6 +53,16 @@ class Document(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
+    
+    # Weighted title/description search vector, kept in sync by the database
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('description', weight='B', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     file = models.FileField(upload_to=document_upload_path, validators=[validate_file_type])
     
     # Metadata
@@ -74,13 +96,30 @@ class Document(models.Model):
     view_count = models.IntegerField(default=0)
     query_count = models.IntegerField(default=0)
     
+    objects = DocumentQuerySet.as_manager()
+    
     class Meta:
         db_table = 'documents_document'
         ordering = ['-uploaded_at']
         indexes = [
-            models.Index(fields=['owner', 'status']),
             models.Index(fields=['is_indexed']),
             models.Index(fields=['file_type']),
+            models.Index(fields=['owner', 'status', '-uploaded_at'], name='doc_owner_status_up_idx'),
+            models.Index(fields=['owner', 'status', '-query_count', '-view_count'], name='doc_owner_status_pop_idx'),
+            models.Index(fields=['owner', 'status', '-last_accessed'], name='doc_owner_status_recent_idx'),
+            GinIndex(fields=['search_vector'], name='doc_search_vector_gin_idx'),
+            # Only in-flight uploads are indexed; cleanup_failed_uploads scans these by age
+            models.Index(
+                fields=['uploaded_at'],
+                condition=Q(status__in=['uploading', 'processing']),
+                name='doc_inflight_uploaded_idx',
+            ),
+            models.Index(fields=['owner', '-uploaded_at'], condition=~Q(status='deleted'), name='doc_active_idx'),
+            models.Index(
+                fields=['owner', 'title'],
+                condition=Q(status__in=['uploading', 'processing', 'ready']),
+                name='doc_owner_title_active_idx',
+            ),
         ]
     
     def __str__(self):
@@ -126,6 +165,13 @@ class DocumentChunk(models.Model):
     page_number = models.IntegerField(null=True, blank=True)
     section_title = models.CharField(max_length=255, blank=True)
     
+    # Full-text search vector, kept in sync by the database
+    content_tsv = models.GeneratedField(
+        expression=SearchVector('content', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    
     # Vector Storage Info
     faiss_index = models.IntegerField(null=True, blank=True)  # Index in FAISS vector store
     embedding_model = models.CharField(max_length=100, blank=True)
@@ -137,8 +183,12 @@ class DocumentChunk(models.Model):
         db_table = 'documents_chunk'
         ordering = ['document', 'chunk_index']
         indexes = [
-            models.Index(fields=['document', 'chunk_index']),
             models.Index(fields=['faiss_index']),
+            GinIndex(fields=['content_tsv'], name='chunk_content_tsv_gin_idx'),
+        ]
+        constraints = [
+            # Lets chunk inserts be retried with ignore_conflicts
+            models.UniqueConstraint(fields=['document', 'chunk_index'], name='chunk_document_index_uniq'),
         ]
     
     def __str__(self):
@@ -206,7 +256,9 @@ from django.dispatch import receiver
 
 @receiver(pre_save, sender=Document)
 def set_file_metadata(sender, instance, **kwargs):
-    if instance.file:
+    # Only for a newly assigned file; status and counter saves would otherwise
+    # hit the storage backend for the file size every time
+    if instance.file and (instance._state.adding or not instance.file._committed):
         # File type from extension
         _, ext = os.path.splitext(instance.file.name)
         instance.file_type = ext.lower().replace(".", "")
@@ -1,9 +1,232 @@
 # documents/services/document_processor.py
+import os
+import shutil
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import List, Dict, Any
 
-class DocumentProcessor:
-    def __init__(self, content):
-        self.content = content
+from django.conf import settings
+from django.utils import timezone
+from ..models import Document, DocumentChunk
 
-    def process(self):
-        # Your document processing logic
-        return self.content.lower()
+logger = logging.getLogger('intellidoc.documents')
+
+@contextmanager
+def local_file_path(field_file):
+    """Yield a filesystem path for a stored file, downloading it once if the storage is remote"""
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        path = None
+    
+    if path is not None:
+        yield path
+        return
+    
+    suffix = os.path.splitext(field_file.name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+        with field_file.open('rb') as src:
+            shutil.copyfileobj(src, tmp)
+        tmp.flush()
+        yield tmp.name
+
+class SimpleDocumentProcessor:
+    """Simplified document processor that works without external dependencies"""
+    
+    def __init__(self):
+        self.setup_directories()
+    
+    def setup_directories(self):
+        """Ensure required directories exist"""
+        try:
+            faiss_path = getattr(settings, 'FAISS_INDEX_PATH', settings.BASE_DIR / 'data' / 'faiss_index')
+            os.makedirs(faiss_path, exist_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not create FAISS directory: {e}")
+    
+    def extract_text_from_file(self, file_path: str, file_type: str) -> tuple[str, dict]:
+        """Extract text from uploaded file"""
+        
+        try:
+            metadata = {"source": file_path}
+            
+            if file_type == 'pdf':
+                # Prefer pdfium (native, much faster); fall back to PyPDF2
+                try:
+                    pages = self.extract_pdf_pages(file_path)
+                    text = "\n".join(pages) + "\n" if pages else ""
+                    metadata.update({
+                        "page_count": len(pages),
+                        "word_count": len(text.split())
+                    })
+                except ImportError:
+                    # Fallback: create placeholder text
+                    text = f"PDF file uploaded: {os.path.basename(file_path)}\nContent extraction requires pypdfium2 or PyPDF2 installation."
+                    metadata.update({"page_count": 1, "word_count": len(text.split())})
+                
+            elif file_type in ['docx', 'doc']:
+                try:
+                    import docx
+                    doc = docx.Document(file_path)
+                    text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+                    metadata.update({
+                        "page_count": 1,
+                        "word_count": len(text.split())
+                    })
+                except ImportError:
+                    text = f"Word document uploaded: {os.path.basename(file_path)}\nContent extraction requires python-docx installation."
+                    metadata.update({"page_count": 1, "word_count": len(text.split())})
+                
+            elif file_type in ['txt', 'md']:
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    text = f.read()
+                metadata.update({
+                    "page_count": 1,
+                    "word_count": len(text.split())
+                })
+            
+            else:
+                text = f"File uploaded: {os.path.basename(file_path)}\nUnsupported file type: {file_type}"
+                metadata.update({"page_count": 1, "word_count": len(text.split())})
+            
+            return text, metadata
+            
+        except Exception as e:
+            logger.error(f"Error extracting text from {file_path}: {str(e)}")
+            # Return fallback text instead of raising exception
+            fallback_text = f"File uploaded: {os.path.basename(file_path)}\nText extraction failed: {str(e)}"
+            return fallback_text, {"page_count": 1, "word_count": len(fallback_text.split())}
+    
+    def extract_pdf_pages(self, file_path: str) -> List[str]:
+        """Text of each PDF page, in order"""
+        
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            import PyPDF2
+            with open(file_path, 'rb') as f:
+                return [page.extract_text() for page in PyPDF2.PdfReader(f).pages]
+        
+        # pdfium is not thread-safe, so pages are read sequentially
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            pages = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return pages
+        finally:
+            pdf.close()
+    
+    def create_chunks(self, text: str, document_id: str) -> List[Dict[str, Any]]:
+        """Split text into chunks for processing"""
+        
+        # Simple chunking - split by paragraphs and limit size. Paragraphs are
+        # collected in a list with a running length and joined once per chunk.
+        chunks = []
+        parts = []
+        current_length = 0
+        
+        def add_chunk():
+            content = "\n\n".join(parts)
+            chunks.append({
+                "content": content.strip(),
+                "chunk_index": len(chunks),
+                "chunk_size": current_length,
+                "metadata": {"document_id": document_id}
+            })
+        
+        for paragraph in text.split('\n\n'):
+            # If adding this paragraph would make chunk too large, save current chunk
+            if current_length + len(paragraph) > 1000 and current_length:
+                add_chunk()
+                parts = [paragraph]
+                current_length = len(paragraph)
+            elif current_length:
+                parts.append(paragraph)
+                current_length += 2 + len(paragraph)
+            else:
+                parts = [paragraph]
+                current_length = len(paragraph)
+        
+        # Add the last chunk
+        if current_length:
+            add_chunk()
+        
+        logger.info(f"Created {len(chunks)} chunks for document {document_id}")
+        return chunks
+    
+    def update_document(self, document: Document, **fields):
+        """Write fields with a single UPDATE and mirror them on the instance"""
+        for name, value in fields.items():
+            setattr(document, name, value)
+        Document.objects.filter(pk=document.pk).update(**fields)
+    
+    def process_document(self, document: Document) -> bool:
+        """Complete document processing pipeline"""
+        
+        try:
+            logger.info(f"Starting to process document {document.id}")
+            
+            # Progress updates are plain UPDATEs; the final save below fires signals
+            self.update_document(document, status='processing', processing_progress=20)
+            
+            # Extract text
+            with local_file_path(document.file) as file_path:
+                text, metadata = self.extract_text_from_file(file_path, document.file_type)
+            
+            # Update document metadata
+            self.update_document(
+                document,
+                page_count=metadata.get('page_count', 0),
+                word_count=metadata.get('word_count', 0),
+                processing_progress=50,
+            )
+            
+            # Create chunks
+            chunks_data = self.create_chunks(text, str(document.id))
+            
+            # Save chunks to database
+            chunk_objects = []
+            for chunk_data in chunks_data:
+                chunk_objects.append(DocumentChunk(
+                    document=document,
+                    content=chunk_data["content"],
+                    chunk_index=chunk_data["chunk_index"],
+                    chunk_size=chunk_data["chunk_size"],
+                    faiss_index=chunk_data["chunk_index"],  # Simple indexing
+                    embedding_model="simple"
+                ))
+            
+            DocumentChunk.objects.bulk_create(chunk_objects, batch_size=500, ignore_conflicts=True)
+            document.chunk_count = len(chunk_objects)
+            
+            # Mark as processed
+            document.status = 'ready'
+            document.processed_at = timezone.now() if hasattr(timezone, 'now') else None
+            document.processing_progress = 100
+            document.is_indexed = True
+            document.embedding_model = "simple"
+            document.save(update_fields=[
+                'status', 'processed_at', 'processing_progress', 'is_indexed',
+                'embedding_model', 'chunk_count',
+            ])
+            
+            logger.info(f"Successfully processed document {document.id}")
+            return True
+            
+        except Exception as e:
+            # Mark as error
+            document.status = 'error'
+            document.error_message = str(e)
+            document.save()
+            
+            logger.error(f"Error processing document {document.id}: {str(e)}")
+            return False
+
+# Maintain the original class name for backward compatibility
+class DocumentProcessor(SimpleDocumentProcessor):
+    pass
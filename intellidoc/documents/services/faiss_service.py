@@ -1,22 +1,132 @@
 # documents/services/faiss_service.py
-import faiss
-import numpy as np
+import logging
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 
-index = faiss.IndexFlatL2(768)  # dimension depends on embeddings used
-doc_embeddings = {}
+from django.conf import settings
 
-def store_embeddings(doc_id, text):
-    # TODO: Replace with real embedding model (SentenceTransformers / OpenAI)
-    embedding = np.random.rand(768).astype("float32")  # dummy
-    index.add(np.array([embedding]))
-    doc_embeddings[doc_id] = embedding
+try:
+    from sentence_transformers import CrossEncoder
+    RERANKER_AVAILABLE = True
+except ImportError:
+    RERANKER_AVAILABLE = False
+
+from ..models import DocumentChunk
+
+logger = logging.getLogger('intellidoc.documents')
+
+RERANK_CANDIDATES_PER_RESULT = 10
+RERANK_BATCH_SIZE = 32
+
+
+@lru_cache(maxsize=None)
+def get_reranker():
+    """Cross-encoder shared by every search in the process"""
+    return CrossEncoder(settings.RERANK_MODEL)
+
+
+def rerank_enabled() -> bool:
+    return RERANKER_AVAILABLE and getattr(settings, 'RERANK_ENABLED', False)
 
-# documents/services/faiss_service.py
 
-class FAISSSearchService:
-    def __init__(self):
-        pass
+class SimpleFAISSSearchService:
+    """Simple search service that works without FAISS"""
+    
+    def search_chunk_ids(self, query: str, k: int = 5, user_documents=None) -> List[Tuple[Any, float]]:
+        """Rank chunks with Postgres full-text search; returns ``(chunk_id, score)`` pairs.
+        
+        ``user_documents`` may be a list of ids or a queryset of ids (used as a subquery).
+        Errors propagate, so callers can tell a failed search from an empty one.
+        """
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        from django.db.models import F
+        
+        # Full-text search in chunks
+        chunks_query = DocumentChunk.objects.all()
+        
+        # Filter by user documents if specified
+        if user_documents is not None:
+            chunks_query = chunks_query.filter(document_id__in=user_documents)
+        
+        # Search in content (GIN index on content_tsv), best matches first
+        search_query = SearchQuery(query, config='english')
+        chunks_query = chunks_query.filter(
+            content_tsv=search_query
+        ).annotate(
+            rank=SearchRank(F('content_tsv'), search_query)
+        ).order_by('-rank')
+        
+        # Optionally rerank a wider shortlist with the cross-encoder
+        if rerank_enabled():
+            candidates = list(chunks_query.only('id', 'content')[:k * RERANK_CANDIDATES_PER_RESULT])
+            scores = get_reranker().predict(
+                [(query, chunk.content) for chunk in candidates],
+                batch_size=RERANK_BATCH_SIZE,
+            ) if candidates else []
+            ranked = sorted(
+                ((chunk.pk, float(score)) for chunk, score in zip(candidates, scores)),
+                key=lambda pair: pair[1],
+                reverse=True,
+            )
+            return ranked[:k]
+        
+        return list(chunks_query.values_list('id', 'rank')[:k])
+    
+    def load_results(self, ranked: List[Tuple[Any, float]], user_documents=None) -> List[Dict[str, Any]]:
+        """Build result dicts for ranked ``(chunk_id, score)`` pairs, keeping their order.
+        
+        Chunks whose document has since left ``user_documents`` are dropped.
+        """
+        chunks = DocumentChunk.objects.filter(
+            pk__in=[chunk_id for chunk_id, _ in ranked]
+        ).select_related('document').defer('content_tsv')
+        if user_documents is not None:
+            chunks = chunks.filter(document_id__in=user_documents)
+        chunks_by_id = {chunk.pk: chunk for chunk in chunks}
+        
+        results = []
+        for chunk_id, score in ranked:
+            chunk = chunks_by_id.get(chunk_id)
+            if chunk is None:
+                continue
+            results.append({
+                "chunk": chunk,
+                "document": chunk.document,
+                "score": score,
+                "content": chunk.content,
+                "page_number": chunk.page_number,
+                "chunk_index": chunk.chunk_index
+            })
+        return results
+    
+    def search_documents(self, query: str, k: int = 5, user_documents=None) -> List[Dict[str, Any]]:
+        """Search documents using Postgres full-text search"""
+        
+        try:
+            results = self.load_results(
+                self.search_chunk_ids(query, k=k, user_documents=user_documents),
+                user_documents=user_documents,
+            )
+            logger.info(f"Found {len(results)} relevant chunks for query: {query}")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error searching documents: {str(e)}")
+            return []
+    
+    def get_document_stats(self) -> Dict[str, Any]:
+        """Get simple statistics"""
+        try:
+            total_chunks = DocumentChunk.objects.count()
+            return {
+                "total_vectors": total_chunks,
+                "dimension": 0,
+                "index_type": "Simple"
+            }
+        except Exception as e:
+            logger.error(f"Error getting stats: {str(e)}")
+            return {"total_vectors": 0, "dimension": 0, "index_type": "Error"}
 
-    def search(self, query):
-        # Your FAISS logic
-        return f"Results for {query}"
+# Maintain original class name for backward compatibility  
+class FAISSSearchService(SimpleFAISSSearchService):
+    pass
\ No newline at end of file
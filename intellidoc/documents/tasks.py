@@ -1,52 +1,105 @@
 # documents/tasks.py
+import asyncio
 import logging
+import threading
+from functools import lru_cache
 from celery import shared_task
 from django.utils import timezone
 from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 
 from .models import Document
 from .services import DocumentProcessor
 from accounts.models import User
+from core.cache import bump_stats_version
 
 logger = logging.getLogger('intellidoc.tasks')
 channel_layer = get_channel_layer()
 
+NOTIFY_TIMEOUT = 5  # seconds
+# Fresh uploads, plus documents a failed attempt marked as error before retrying
+CLAIMABLE_STATUSES = ('uploading', 'error')
+
+
+class Notifier:
+    """Sends channel-layer messages from sync code on one long-lived event loop.
+    
+    ``async_to_sync`` builds a new loop (and Redis connection) per call; here the
+    loop is started lazily in each worker process and reused for every send.
+    """
+    
+    def __init__(self):
+        self._loop = None
+        self._lock = threading.Lock()
+    
+    def reset(self):
+        """Drop any loop inherited across fork and start a fresh one"""
+        self._loop = None
+        self._lock = threading.Lock()
+        self._get_loop()
+    
+    def _get_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="channel-notifier", daemon=True
+                ).start()
+            return self._loop
+    
+    def send(self, user_id, message: dict):
+        """Push a document_processing_update to the user's group"""
+        future = asyncio.run_coroutine_threadsafe(
+            channel_layer.group_send(
+                f"user_{user_id}",
+                {"type": "document_processing_update", "message": message},
+            ),
+            self._get_loop(),
+        )
+        return future.result(NOTIFY_TIMEOUT)
+
+
+notifier = Notifier()
+
+
+@lru_cache(maxsize=None)
+def get_processor():
+    """One DocumentProcessor per worker process, built at worker init"""
+    return DocumentProcessor()
+
 @shared_task(bind=True, max_retries=3)
 def process_document_task(self, document_id: str, user_id: int):
     """Background task to process uploaded document"""
     
     try:
-        # Get document and user
+        # Claim the document with one conditional UPDATE; a duplicate delivery
+        # finds it already processing (or ready) and stops here
+        claimed = Document.objects.filter(
+            id=document_id, status__in=CLAIMABLE_STATUSES
+        ).update(status='processing', processing_progress=10)
+        if not claimed:
+            logger.info(f"Document {document_id} already claimed, skipping")
+            return
+        bump_stats_version(user_id)
+        
+        # Get document; update_usage only needs the owner's pk, so no user query or join
         document = Document.objects.get(id=document_id)
-        user = User.objects.get(id=user_id)
+        user = User(pk=document.owner_id)
         
         logger.info(f"Starting to process document {document_id}")
         
-        # Update document status to processing
-        document.status = 'processing'
-        document.processing_progress = 10
-        document.save()
-        
         # Send real-time update if channels are configured
         try:
-            async_to_sync(channel_layer.group_send)(
-                f"user_{user_id}",
-                {
-                    "type": "document_processing_update",
-                    "message": {
-                        "document_id": document_id,
-                        "status": "processing",
-                        "progress": 10,
-                        "message": "Starting document processing..."
-                    }
-                }
-            )
+            notifier.send(user_id, {
+                "document_id": document_id,
+                "status": "processing",
+                "progress": 10,
+                "message": "Starting document processing..."
+            })
         except Exception as e:
             logger.warning(f"Could not send real-time update: {e}")
         
         # Process document
-        processor = DocumentProcessor()
+        processor = get_processor()
         success = processor.process_document(document)
         
         if success:
@@ -58,20 +111,14 @@ def process_document_task(self, document_id: str, user_id: int):
             
             # Send success notification
             try:
-                async_to_sync(channel_layer.group_send)(
-                    f"user_{user_id}",
-                    {
-                        "type": "document_processing_update", 
-                        "message": {
-                            "document_id": document_id,
-                            "status": "ready",
-                            "progress": 100,
-                            "message": f"✅ {document.title} is ready for queries!",
-                            "chunk_count": document.chunk_count,
-                            "word_count": document.word_count
-                        }
-                    }
-                )
+                notifier.send(user_id, {
+                    "document_id": document_id,
+                    "status": "ready",
+                    "progress": 100,
+                    "message": f"✅ {document.title} is ready for queries!",
+                    "chunk_count": document.chunk_count,
+                    "word_count": document.word_count
+                })
             except Exception as e:
                 logger.warning(f"Could not send success notification: {e}")
             
@@ -80,19 +127,13 @@ def process_document_task(self, document_id: str, user_id: int):
         else:
             # Send error notification  
             try:
-                async_to_sync(channel_layer.group_send)(
-                    f"user_{user_id}",
-                    {
-                        "type": "document_processing_update",
-                        "message": {
-                            "document_id": document_id,
-                            "status": "error", 
-                            "progress": 0,
-                            "message": f"❌ Error processing {document.title}",
-                            "error": document.error_message
-                        }
-                    }
-                )
+                notifier.send(user_id, {
+                    "document_id": document_id,
+                    "status": "error",
+                    "progress": 0,
+                    "message": f"❌ Error processing {document.title}",
+                    "error": document.error_message
+                })
             except Exception as e:
                 logger.warning(f"Could not send error notification: {e}")
             
@@ -129,11 +170,14 @@ def cleanup_failed_uploads():
         uploaded_at__lt=cutoff_time
     )
     
-    count = failed_docs.count()
-    for doc in failed_docs:
-        logger.info(f"Cleaning up failed document: {doc.id}")
-        doc.status = 'error'
-        doc.error_message = "Processing timed out after 24 hours"
-        doc.save()
+    # One UPDATE for all rows; it skips post_save, so bump each owner's stats here
+    owner_ids = set(failed_docs.values_list('owner_id', flat=True))
+    count = failed_docs.update(
+        status='error',
+        error_message="Processing timed out after 24 hours"
+    )
+    for owner_id in owner_ids:
+        bump_stats_version(owner_id)
     
+    logger.info(f"Cleaned up {count} failed documents")
     return f"Cleaned up {count} failed documents"
\ No newline at end of file
@@ -1,11 +1,151 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from .models import Document, DocumentChunk, DocumentCollection
+from .tasks import process_document_task
+from .views import KnownCountPaginator
+
+
+def make_documents(owner, count, **fields):
+    # bulk_create skips the pre_save hook that stats the uploaded file
+    fields.setdefault('status', 'ready')
+    return Document.objects.bulk_create([
+        Document(
+            owner=owner, title=f"doc {i}", file=f"documents/{i}.txt",
+            file_type="txt", file_size=10, **fields
+        )
+        for i in range(count)
+    ])
+
+
+class KnownCountPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(email="pages@example.com", password="pw")
+        [cls.document] = make_documents(owner, 1)
+        DocumentChunk.objects.bulk_create([
+            DocumentChunk(document=cls.document, content=f"chunk {i}", chunk_index=i, chunk_size=7)
+            for i in range(25)
+        ])
+
+    def test_page_without_count_query(self):
+        chunks = DocumentChunk.objects.filter(document=self.document).order_by('chunk_index')
+        paginator = KnownCountPaginator(chunks, 10, count=25)
+        with CaptureQueriesContext(connection) as queries:
+            page = paginator.get_page(3)
+            chunk_indexes = [chunk.chunk_index for chunk in page]
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT(", queries[0]["sql"].upper())
+        self.assertEqual(chunk_indexes, [20, 21, 22, 23, 24])
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertFalse(page.has_next())
+
+    def test_out_of_range_page_falls_back_to_last(self):
+        chunks = DocumentChunk.objects.filter(document=self.document).order_by('chunk_index')
+        page = KnownCountPaginator(chunks, 10, count=25).get_page(99)
+        self.assertEqual(page.number, 3)
+
+
+class BulkDocumentViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="bulk@example.com", password="pw")
+        cls.other = User.objects.create_user(email="other@example.com", password="pw")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.documents = make_documents(self.user, 3)
+        [self.foreign] = make_documents(self.other, 1)
+        self.collection = DocumentCollection.objects.create(owner=self.user, name="papers")
+
+    def test_bulk_add_skips_foreign_and_existing(self):
+        self.collection.documents.add(self.documents[0])
+        response = self.client.post(reverse('documents:bulk_add_to_collection'), {
+            'collection_id': self.collection.pk,
+            'document_ids': [d.pk for d in self.documents] + [self.foreign.pk],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['added_count'], 3)
+        self.assertQuerySetEqual(
+            self.collection.documents.order_by('title'), self.documents, ordered=True
+        )
+
+    def test_bulk_add_missing_parameters(self):
+        response = self.client.post(reverse('documents:bulk_add_to_collection'), {
+            'document_ids': [self.documents[0].pk],
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_add_to_foreign_collection(self):
+        foreign_collection = DocumentCollection.objects.create(owner=self.other, name="theirs")
+        response = self.client.post(reverse('documents:bulk_add_to_collection'), {
+            'collection_id': foreign_collection.pk,
+            'document_ids': [self.documents[0].pk],
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(foreign_collection.documents.exists())
+
+    def test_bulk_delete_soft_deletes_own_documents(self):
+        User.objects.filter(pk=self.user.pk).update(storage_used=100)
+        response = self.client.post(reverse('documents:bulk_delete'), {
+            'document_ids': [self.documents[0].pk, self.documents[1].pk, self.foreign.pk],
+        })
+        self.assertEqual(response.json()['deleted_count'], 2)
+        self.assertEqual(
+            set(Document.objects.active().values_list('pk', flat=True)),
+            {self.documents[2].pk, self.foreign.pk},
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.storage_used, 80)
+
+    def test_bulk_delete_requires_selection(self):
+        response = self.client.post(reverse('documents:bulk_delete'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Document.objects.active().count(), 4)
+
+
+@patch('documents.tasks.notifier')
+@patch('documents.tasks.get_processor')
+class ProcessDocumentClaimTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="tasks@example.com", password="pw")
+
+    def run_task(self, document):
+        process_document_task.apply(args=(str(document.pk), self.user.pk))
 
-# Create your tests here.
-# documents/tasks.py
+    def test_claims_fresh_upload(self, get_processor, notifier):
+        [document] = make_documents(self.user, 1, status='uploading')
+        get_processor.return_value.process_document.return_value = True
+        self.run_task(document)
+        get_processor.return_value.process_document.assert_called_once()
+        claimed = get_processor.return_value.process_document.call_args.args[0]
+        self.assertEqual(claimed.status, 'processing')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.documents_uploaded, 1)
 
-from .services import DocumentProcessor, FAISSSearchService
+    def test_reclaims_errored_document(self, get_processor, notifier):
+        [document] = make_documents(self.user, 1, status='error')
+        get_processor.return_value.process_document.return_value = True
+        self.run_task(document)
+        get_processor.return_value.process_document.assert_called_once()
 
-def process_document_task(content):
-    processor = DocumentProcessor(content)
-    processed_content = processor.process()
-    return processed_content
+    def test_skips_document_already_claimed(self, get_processor, notifier):
+        for status in ('processing', 'ready'):
+            with self.subTest(status=status):
+                [document] = make_documents(self.user, 1, status=status)
+                self.run_task(document)
+                get_processor.return_value.process_document.assert_not_called()
+                document.refresh_from_db()
+                self.assertEqual(document.status, status)
+        notifier.send.assert_not_called()
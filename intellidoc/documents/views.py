@@ -1,8 +1,8 @@
+import hashlib
 import json
 import logging
+import os
 from typing import Dict, Any
-from .tasks import process_document_task
-from .services import DocumentProcessor, FAISSSearchService  # Add this line
 
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
@@ -12,10 +12,18 @@ from django.http import JsonResponse, HttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import ListView, DetailView, CreateView
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.functional import cached_property
 
+from core.cache import (
+    SEARCH_CACHE_TIMEOUT, SEARCH_RESULTS_KEY, STATS_CACHE_TIMEOUT, USER_COLLECTIONS_KEY,
+    bump_stats_version, search_version, stats_version,
+)
 from .models import Document, DocumentCollection, DocumentChunk
 from .forms import DocumentUploadForm, CollectionForm
 from .tasks import process_document_task
@@ -23,6 +31,35 @@ from .services import FAISSSearchService
 
 logger = logging.getLogger('intellidoc.documents')
 
+# Upload extension -> Document.file_type
+_TYPE_MAPPING = {
+    'pdf': 'pdf',
+    'docx': 'docx',
+    'doc': 'docx',
+    'txt': 'txt',
+    'md': 'md',
+}
+
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+
+# Static HTMX fragments, encoded once rather than on every keystroke
+_HTML_FILE_TOO_LARGE = (
+    f'<div class="text-red-500 text-sm mt-1">❌ File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024*1024)}MB</div>'
+).encode()
+_HTML_TITLE_TAKEN = '<div class="text-red-500 text-sm mt-1">A document with this title already exists</div>'.encode()
+_HTML_TITLE_OK = '<div class="text-green-500 text-sm mt-1">✓ Title is available</div>'.encode()
+
+class KnownCountPaginator(Paginator):
+    """Paginator for a list whose size is already known, skipping the COUNT query"""
+    
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._known_count = count
+    
+    @cached_property
+    def count(self):
+        return self._known_count
+
 class DocumentListView(LoginRequiredMixin, ListView):
     """Document dashboard with advanced filtering"""
     
@@ -32,16 +69,15 @@ class DocumentListView(LoginRequiredMixin, ListView):
     paginate_by = 12
     
     def get_queryset(self):
-        queryset = Document.objects.filter(
+        queryset = Document.objects.active().filter(
             owner=self.request.user
-        ).exclude(status='deleted').order_by('-uploaded_at')
+        ).order_by('-uploaded_at')
         
         # Search filter
         search = self.request.GET.get('search')
         if search:
             queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search)
+                search_vector=SearchQuery(search, config='english')
             )
         
         # Status filter
@@ -59,20 +95,25 @@ class DocumentListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Add collections
-        context['collections'] = DocumentCollection.objects.filter(
-            owner=self.request.user
-        ).annotate(doc_count=Count('documents'))
+        # Add collections; cached until the user's documents or collections change
+        user = self.request.user
+        context['collections'] = cache.get_or_set(
+            USER_COLLECTIONS_KEY.format(user_id=user.id, version=stats_version(user.id)),
+            lambda: list(
+                DocumentCollection.objects.filter(owner=user).annotate(doc_count=Count('documents'))
+            ),
+            STATS_CACHE_TIMEOUT,
+        )
         
         # Add statistics
-        user_docs = Document.objects.filter(owner=self.request.user).exclude(status='deleted')
-        context['stats'] = {
-            'total_documents': user_docs.count(),
-            'ready_documents': user_docs.filter(status='ready').count(),
-            'processing_documents': user_docs.filter(status='processing').count(),
-            'total_storage': sum(doc.file_size for doc in user_docs),
-            'total_queries': sum(doc.query_count for doc in user_docs),
-        }
+        user_docs = Document.objects.active().filter(owner=self.request.user)
+        context['stats'] = user_docs.aggregate(
+            total_documents=Count('id'),
+            ready_documents=Count('id', filter=Q(status='ready')),
+            processing_documents=Count('id', filter=Q(status='processing')),
+            total_storage=Coalesce(Sum('file_size'), 0),
+            total_queries=Coalesce(Sum('query_count'), 0),
+        )
         
         # Add current filters for template
         context['current_search'] = self.request.GET.get('search', '')
@@ -99,15 +140,8 @@ def document_upload_view(request):
             document.owner = request.user
             
             # Determine file type
-            file_ext = document.file.name.split('.')[-1].lower()
-            type_mapping = {
-                'pdf': 'pdf',
-                'docx': 'docx', 
-                'doc': 'docx',
-                'txt': 'txt',
-                'md': 'md'
-            }
-            document.file_type = type_mapping.get(file_ext, 'txt')
+            file_ext = os.path.splitext(document.file.name)[1][1:].lower()
+            document.file_type = _TYPE_MAPPING.get(file_ext, 'txt')
             document.file_size = document.file.size
             
             document.save()
@@ -143,8 +177,7 @@ def document_upload_view(request):
         form = DocumentUploadForm(user=request.user)
     
     # ✅ Always send recent uploads to the template
-    recent_uploads = Document.objects.filter(owner=request.user)\
-        .exclude(status='deleted')\
+    recent_uploads = Document.objects.active().filter(owner=request.user)\
         .order_by('-uploaded_at')[:5]
 
     return render(request, 'documents/upload.html', {
@@ -173,16 +206,33 @@ def document_search_view(request):
     
     # Semantic search using FAISS
     search_service = FAISSSearchService()
-    user_document_ids = list(
-        Document.objects.filter(owner=request.user, status='ready')
-        .values_list('id', flat=True)
+    # Passed as a subquery so the search is a single round-trip
+    user_document_ids = Document.objects.filter(
+        owner=request.user, status='ready'
+    ).values('id')
+    
+    # Ranked chunk ids are cached until the user's searchable content changes;
+    # failed searches are not cached
+    cache_key = SEARCH_RESULTS_KEY.format(
+        user_id=request.user.id,
+        version=search_version(request.user.id),
+        digest=hashlib.sha256(query.strip().lower().encode()).hexdigest(),
     )
+    ranked = cache.get(cache_key)
+    if ranked is None:
+        try:
+            ranked = search_service.search_chunk_ids(
+                query=query,
+                k=10,
+                user_documents=user_document_ids
+            )
+        except Exception as e:
+            logger.error(f"Error searching documents: {str(e)}")
+            ranked = []
+        else:
+            cache.set(cache_key, ranked, SEARCH_CACHE_TIMEOUT)
     
-    search_results = search_service.search_documents(
-        query=query,
-        k=10,
-        user_documents=[str(doc_id) for doc_id in user_document_ids]
-    )
+    search_results = search_service.load_results(ranked, user_documents=user_document_ids)
     
     # Group results by document
     documents_dict = {}
@@ -218,15 +268,15 @@ def document_detail_view(request, document_id):
     # Get document chunks
     chunks = DocumentChunk.objects.filter(document=document).order_by('chunk_index')
     
-    # Pagination for chunks
-    paginator = Paginator(chunks, 10)
+    # Pagination for chunks; the total is stored on the document
+    paginator = KnownCountPaginator(chunks, 10, count=document.chunk_count)
     page_number = request.GET.get('page')
     chunks_page = paginator.get_page(page_number)
     
     context = {
         'document': document,
         'chunks': chunks_page,
-        'total_chunks': chunks.count(),
+        'total_chunks': paginator.count,
     }
     
     return render(request, 'documents/detail.html', context)
@@ -306,17 +356,16 @@ def validate_title(request):
     title = request.POST.get('title', '').strip()
     
     if not title:
-        return HttpResponse('')
+        return HttpResponse(b'')
     
-    # Check for duplicate titles
-    if Document.objects.filter(owner=request.user, title=title).exists():
-        return HttpResponse(
-            '<div class="text-red-500 text-sm mt-1">A document with this title already exists</div>'
-        )
+    # Check for duplicate titles; same predicate as DocumentUploadForm.clean_title,
+    # so the partial (owner, title) index serves it
+    if Document.objects.filter(
+        owner=request.user, title=title, status__in=['uploading', 'processing', 'ready']
+    ).exists():
+        return HttpResponse(_HTML_TITLE_TAKEN)
     
-    return HttpResponse(
-        '<div class="text-green-500 text-sm mt-1">✓ Title is available</div>'
-    )
+    return HttpResponse(_HTML_TITLE_OK)
 
 @login_required
 @require_http_methods(["POST"])
@@ -325,14 +374,11 @@ def validate_file(request):
     file = request.FILES.get('file')
     
     if not file:
-        return HttpResponse('')
+        return HttpResponse(b'')
     
     # File size check
-    max_size = 50 * 1024 * 1024  # 50MB
-    if file.size > max_size:
-        return HttpResponse(
-            f'<div class="text-red-500 text-sm mt-1">❌ File too large. Maximum size is {max_size // (1024*1024)}MB</div>'
-        )
+    if file.size > MAX_UPLOAD_SIZE:
+        return HttpResponse(_HTML_FILE_TOO_LARGE)
     
     # User limits check
     can_upload, message = request.user.can_upload_document(file.size)
@@ -355,24 +401,25 @@ def bulk_delete_documents(request):
         return JsonResponse({'error': 'No documents selected'}, status=400)
     
     # Get user documents
-    documents = Document.objects.filter(
+    documents = Document.objects.active().filter(
         id__in=document_ids,
         owner=request.user
-    ).exclude(status='deleted')
+    )
     
     # Calculate storage to free up
-    total_storage = sum(doc.file_size for doc in documents)
+    total_storage = documents.aggregate(total=Coalesce(Sum('file_size'), 0))['total']
     
     # Soft delete documents
-    documents.update(status='deleted')
+    deleted_count = documents.update(status='deleted')
+    bump_stats_version(request.user.id)  # queryset updates skip post_save
     
     # Update user storage
     request.user.update_usage(storage_delta=-total_storage)
     
     return JsonResponse({
         'success': True,
-        'deleted_count': documents.count(),
-        'message': f'Successfully deleted {documents.count()} documents'
+        'deleted_count': deleted_count,
+        'message': f'Successfully deleted {deleted_count} documents'
     })
 
 @login_required
@@ -391,18 +438,24 @@ def bulk_add_to_collection(request):
             owner=request.user
         )
         
-        documents = Document.objects.filter(
+        valid_ids = list(Document.objects.active().filter(
             id__in=document_ids,
             owner=request.user
-        ).exclude(status='deleted')
+        ).values_list('id', flat=True))
         
-        # Add documents to collection
-        collection.documents.add(*documents)
+        # Add documents to collection in one INSERT; existing pairs are skipped
+        Through = DocumentCollection.documents.through
+        Through.objects.bulk_create(
+            [Through(documentcollection_id=collection.id, document_id=doc_id) for doc_id in valid_ids],
+            ignore_conflicts=True,
+            batch_size=500,
+        )
+        bump_stats_version(request.user.id)  # bulk_create skips m2m_changed
         
         return JsonResponse({
             'success': True,
-            'added_count': documents.count(),
-            'message': f'Added {documents.count()} documents to {collection.name}'
+            'added_count': len(valid_ids),
+            'message': f'Added {len(valid_ids)} documents to {collection.name}'
         })
         
     except DocumentCollection.DoesNotExist:
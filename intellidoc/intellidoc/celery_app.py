@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intellidoc.settings')
 
@@ -10,3 +11,11 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Autodiscover tasks.py in all apps
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Give each worker process its own notification loop and document processor before the first task"""
+    from documents.tasks import get_processor, notifier
+    notifier.reset()
+    get_processor()
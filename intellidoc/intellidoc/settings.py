@@ -21,7 +21,6 @@ DJANGO_APPS = [
 ]
 
 THIRD_PARTY_APPS = [
-    'rest_framework',
     'ninja',
     'channels',
     'corsheaders',
@@ -59,8 +58,13 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -83,6 +87,10 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default='your_password'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Persistent connections only where DB_CONN_MAX_AGE is set (the Celery
+        # workers); under ASGI they are tied to per-request threads and leak
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -92,10 +100,14 @@ REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 # Channels
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels_redis.core.RedisChannelLayer" if not DEBUG else "channels.layers.InMemoryChannelLayer",
+        # Redis in DEBUG too: Celery workers run in other processes and must reach consumers
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
             "hosts": [REDIS_URL],
-        } if not DEBUG else {},
+            "capacity": 1500,
+            "expiry": 10,
+            "group_expiry": 86400,
+        },
     },
 }
 
@@ -107,6 +119,13 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_TASK_ALWAYS_EAGER = False
+# Keep long AI jobs from head-of-line blocking document processing
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_ROUTES = {
+    'chat.tasks.*': {'queue': 'ai'},
+    'documents.tasks.*': {'queue': 'docs'},
+}
 
 # Cache
 CACHES = {
@@ -138,21 +157,17 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024   # 50MB
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.SessionUserBackend',
+]
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# REST Framework
-REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
-    ],
-    'DEFAULT_PERMISSION_CLASSES': [
-        'rest_framework.permissions.IsAuthenticated',
-    ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20,
-}
+# Django Ninja (serves the read API mounted at /api/); list endpoints use
+# LimitOffsetPagination, which rejects a limit above the max with a 422
+NINJA_PAGINATION_PER_PAGE = 25
+NINJA_PAGINATION_MAX_LIMIT = 100
 
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
@@ -164,6 +179,8 @@ CORS_ALLOWED_ORIGINS = [
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
 FAISS_INDEX_PATH = BASE_DIR / 'data' / 'faiss_index'
+RERANK_ENABLED = config('RERANK_ENABLED', default=False, cast=bool)
+RERANK_MODEL = 'BAAI/bge-reranker-v2-m3'
 
 # Logging
 LOGGING = {
@@ -3,9 +3,11 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from api.api import api
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    # path('api/', api.urls),
+    path('api/', api.urls),
     path('', include('core.urls')),
     path('accounts/', include('accounts.urls')),
     path('documents/', include('documents.urls')),